@@ -0,0 +1,29 @@
+"""Add posts.views
+
+Revision ID: 3b8d5f2a9c41
+Revises: ebf09a55607e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d5f2a9c41'
+down_revision: Union[str, Sequence[str], None] = 'ebf09a55607e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default: mavjud qatorlar 0 bilan to'ladi
+    op.add_column('posts', sa.Column('views', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'views')
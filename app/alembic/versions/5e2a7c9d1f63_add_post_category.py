@@ -0,0 +1,31 @@
+"""Add posts.category with (category, id) index
+
+Revision ID: 5e2a7c9d1f63
+Revises: 3b8d5f2a9c41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a7c9d1f63'
+down_revision: Union[str, Sequence[str], None] = '3b8d5f2a9c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('category', sa.String(length=50), nullable=True))
+    # Kategoriya feed i keyset pagination bilan: (category, id) range scan
+    op.create_index('ix_posts_category_id', 'posts', ['category', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_category_id', table_name='posts')
+    op.drop_column('posts', 'category')
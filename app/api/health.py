@@ -0,0 +1,52 @@
+"""
+Health Routes - liveness va readiness probelar.
+
+/health/live   - process va event loop javob beryapti (I/O yo'q)
+/health/ready  - warmup tugagan, DB va Redis ishlayapti (cache qilingan)
+/health        - eski endpoint, readiness bilan bir xil ma'lumot (doim 200)
+"""
+from fastapi import APIRouter, Request, status
+
+from core.config import settings
+from core.health import readiness_checker
+from core.responses import FastJSONResponse
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+async def _readiness(request: Request) -> dict:
+    checks = await readiness_checker.results()
+    ready = getattr(request.app.state, "ready", False)
+    healthy = ready and all(value == "healthy" for value in checks.values())
+    return {
+        "status": "healthy" if healthy else "degraded",
+        "ready": ready,
+        **checks,
+        "environment": settings.ENVIRONMENT,
+    }
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe - no dependency I/O, only proves the loop is serving"""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """
+    Readiness probe - 503 until warmup finished or while DB/Redis fail.
+
+    Results are cached for HEALTH_CACHE_TTL seconds.
+    """
+    body = await _readiness(request)
+    status_code = (
+        status.HTTP_200_OK if body["status"] == "healthy" else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    return FastJSONResponse(body, status_code=status_code)
+
+
+@router.get("")
+async def health_check(request: Request):
+    """Backward compatible summary (always 200, status shows degraded)"""
+    return await _readiness(request)
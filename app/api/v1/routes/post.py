@@ -1,18 +1,22 @@
 """
 Post Routes - ASYNC version
 """
+import asyncio
+
 from fastapi import APIRouter, Depends, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from core.redis_client import redis_client
-import json
-
+from core.config import settings
+from core.jobs import job_queue
+from core.responses import FastJSONResponse
 from core.dependencies import get_async_db, get_authenticated_user
 from schemas.post import PostCreate, PostResponse
-from services import post_service
+from services import post_cache, post_service, view_counter
+from services.post_batcher import post_batcher
+from services.post_jobs import POST_CREATED, POST_DELETED
 from models.user import User
 
 # Rate limiter
@@ -26,6 +30,7 @@ router = APIRouter(prefix="/posts", tags=["Posts"])
 # ========================================
 @router.get("/")
 async def get_posts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_async_db)  # ← ASYNC!
@@ -34,32 +39,31 @@ async def get_posts(
     Get all posts with cache (ASYNC).
     
     Performance: 3-5x faster than sync version
+
+    Cache hit: cached JSON bytes are sent as-is (no decode/re-encode),
+    already compressed for the client's Accept-Encoding.
     """
     
     # Cache key
-    cache_key = f"posts:{skip}:{limit}"
+    cache_key = post_cache.page_key(skip, limit)
+    encoding = post_cache.accepted_encoding(request.headers.get("accept-encoding"))
     
-    # Try cache
-    cached = redis_client.get(cache_key)
-    if cached:
-        return json.loads(cached)
+    # Try cache - sync Redis + siqish thread da, event loop bloklanmaydi
+    cached = await asyncio.to_thread(post_cache.get_page, cache_key, encoding)
+    if cached is not None:
+        return post_cache.page_response(cached)
     
     # Get from DB (ASYNC!)
     if limit > 100:
         limit = 100
     
-    posts = await post_service.get_posts(db=db, skip=skip, limit=limit)  # ← await!
+    # Bir marta encode: cache ga ham, response ga ham shu bytes
+    body = await post_cache.build_page(db, skip, limit)
     
-    # Convert to dict
-    posts_data = [
-        {"id": p.id, "title": p.title, "content": p.content}
-        for p in posts
-    ]
+    # Save to cache (60s) - identity + siqilgan variant
+    page = await asyncio.to_thread(post_cache.store_page, cache_key, body, encoding)
     
-    # Save to cache (60s)
-    redis_client.set(cache_key, json.dumps(posts_data), ex=60)
-    
-    return posts_data
+    return post_cache.page_response(page)
 
 
 @router.get("/{post_id}")
@@ -71,11 +75,13 @@ async def get_post(
     Get single post by ID (ASYNC).
     """
     post = await post_service.get_post(db=db, post_id=post_id)
-    return {
+    await view_counter.record_view(post.id)
+    # Response qaytadi - FastAPI jsonable_encoder pass qilmaydi
+    return FastJSONResponse({
         "id": post.id,
         "title": post.title,
         "content": post.content
-    }
+    })
 
 
 # ========================================
@@ -99,8 +105,16 @@ async def create_post(
     Rate limit: 10 posts per minute.
     
     ASYNC version - faster response time
+
+    POST_BATCH_ENABLED: concurrent creates share one commit (group commit)
+
+    Side effects (cache invalidation) run as a background job after commit.
     """
-    created_post = await post_service.create_post(db=db, post=post)  # ← await!
+    if settings.POST_BATCH_ENABLED:
+        created_post = await post_batcher.submit(post)
+    else:
+        created_post = await post_service.create_post(db=db, post=post)  # ← await!
+    job_queue.enqueue(POST_CREATED, post_id=created_post.id, category=created_post.category)
     return created_post
 
 
@@ -121,8 +135,11 @@ async def delete_post(
     Rate limit: 20 deletions per minute.
     
     ASYNC version
+
+    Side effects (cache invalidation) run as a background job after commit.
     """
     await post_service.delete_post(db=db, post_id=post_id)  # ← await!
+    job_queue.enqueue(POST_DELETED, post_id=post_id)
     return None
 
 
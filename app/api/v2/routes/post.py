@@ -1,20 +1,57 @@
-from fastapi import APIRouter
-from typing import List
+"""
+Post Routes v2 - category va views bilan.
+
+Listing keyset pagination bilan: ?category=tech&cursor=<oldingi sahifadagi
+next_cursor>. (category, id) index bo'yicha range scan, sahifalar
+kategoriya bo'yicha cache qilinadi (services.feed_cache).
+
+Views write-behind hisoblanadi (services.view_counter): o'qish faqat
+cache da HINCRBY, javobdagi son = DB dagi qiymat + hali yozilmagan delta.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import get_async_db
+from core.responses import FastJSONResponse
+from schemas.post import PostV2Response
+from services import feed_cache, post_service, view_counter
 
 router = APIRouter(prefix="/posts", tags=["Posts v2"])
 
+
 @router.get("/")
-def get_posts_v2():
-    """v2 - Yangi format"""
-    return {
+async def get_posts_v2(
+    category: Optional[str] = Query(default=None, min_length=1, max_length=50),
+    cursor: Optional[int] = Query(default=None, gt=0, description="next_cursor of the previous page"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """v2 - newest first, optional category filter, cursor pagination"""
+    page = await feed_cache.get_feed_page(db, category, cursor, limit)
+    # Response qaytadi - FastAPI jsonable_encoder pass qilmaydi
+    return FastJSONResponse({
         "version": "v2",
-        "data": [
-            {
-                "id": 1,
-                "title": "Post 1",
-                "content": "Content",
-                "category": "tech",  # ← v2 da yangi!
-                "views": 100         # ← v2 da yangi!
-            }
-        ]
-    }
\ No newline at end of file
+        "data": page["items"],
+        "next_cursor": page["next_cursor"],
+    })
+
+
+@router.get("/{post_id}", response_model=PostV2Response)
+async def get_post_v2(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Single post; counts one view (no DB write on the request path)"""
+    post = await post_service.get_post(db=db, post_id=post_id)
+    # HINCRBY yangi deltani qaytaradi - alohida HMGET kerak emas
+    pending = await view_counter.record_view(post.id)
+    # response_model faqat OpenAPI uchun - Response validation / encoder siz yuboriladi
+    return FastJSONResponse({
+        "id": post.id,
+        "title": post.title,
+        "content": post.content,
+        "category": post.category,
+        "views": post.views + pending,
+    })
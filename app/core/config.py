@@ -22,11 +22,13 @@ class Settings(BaseSettings):
     # ========================================
     # DATABASE
     # ========================================
+    # mysql+pymysql://... (docker-compose) yoki sqlite:///./blog.db (servissiz, lokal)
     DATABASE_URL: str
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 20
     DB_POOL_RECYCLE: int = 3600
     DB_ECHO: bool = False
+    DB_SLOW_QUERY_THRESHOLD_MS: float = 200.0   # Bundan sekin querylar log qilinadi
     
     # ========================================
     # SECURITY
@@ -58,7 +60,7 @@ class Settings(BaseSettings):
                 return [origin.strip() for origin in v.split(",")]
         return v
     
-    @field_validator("ALLOWED_METHODS", "ALLOWED_HEADERS", mode="before")
+    @field_validator("ALLOWED_METHODS", "ALLOWED_HEADERS", "COMPRESSION_ENCODINGS", mode="before")
     @classmethod
     def parse_list_fields(cls, v):
         """Parse list fields from string"""
@@ -73,11 +75,12 @@ class Settings(BaseSettings):
     # ========================================
     # REDIS (optional)
     # ========================================
+    CACHE_BACKEND: str = "redis"             # "redis" | "memory" (bitta process, servissiz)
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
-    REDIS_URL: str | None = None
+    REDIS_URL: str | None = None             # berilsa HOST/PORT/DB/PASSWORD o'rniga
     
     # ========================================
     # EMAIL (optional)
@@ -127,6 +130,106 @@ class Settings(BaseSettings):
     LOG_FILE_PATH: str = "/app/logs/app.log"
     LOG_MAX_BYTES: int = 10485760  # 10MB
     LOG_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000              # Bounded logging queue
+    LOG_QUEUE_OVERFLOW: str = "drop"         # "drop" | "block"
+    LOG_FORMATTER: str = "text"              # "text" | "json" (production)
+    
+    # ========================================
+    # OBSERVABILITY
+    # ========================================
+    TRUST_INCOMING_REQUEST_ID: bool = True   # X-Request-ID / traceparent qabul qilish
+    SLOW_REQUEST_THRESHOLD: float = 1.0      # seconds
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0      # 2xx/3xx ulushi (xato va sekinlar doim)
+    SERVER_TIMING: str = "off"               # "off" | "all" | "sampled" | "admin"
+    SERVER_TIMING_SAMPLE_RATE: float = 0.01
+    ADMIN_TOKEN: str = ""                    # X-Admin-Token (bo'sh = o'chirilgan)
+    LOOP_MONITOR_ENABLED: bool = True        # Event loop lag / blocking call detector
+    LOOP_MONITOR_INTERVAL: float = 0.1       # seconds
+    LOOP_LAG_THRESHOLD: float = 0.1          # seconds - bundan uzun stall stack bilan log
+    PROFILING_ENABLED: bool = False          # X-Profile: 1 + X-Admin-Token
+    PROFILE_SAMPLE_RATE: float = 0.0         # Header siz profil qilinadigan ulush
+    PROFILE_INTERVAL: float = 0.005          # seconds between stack samples
+    PROFILE_DIR: str = "/app/profiles"
+    PROFILE_MAX_FILES: int = 100             # eng yangilari qoladi (0 = cheksiz)
+    TRAFFIC_CAPTURE_ENABLED: bool = False    # benchmarks/replay.py uchun JSONL
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 0.01
+    TRAFFIC_CAPTURE_PATH: str = "/app/logs/traffic-{pid}.jsonl"   # {pid} - har worker alohida
+    TRAFFIC_CAPTURE_MAX_BODY: int = 4096     # bytes - kattaroq body yozilmaydi
+    
+    # ========================================
+    # SERVER (serve.py)
+    # ========================================
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 0                 # 0 = CPU soniga qarab
+    MAX_WORKERS: int = 8
+    SERVER_KEEPALIVE: int = 65               # seconds - load balancer idle timeout dan uzun
+    SERVER_BACKLOG: int = 2048               # listen() queue
+    SERVER_GRACEFUL_TIMEOUT: int = 30        # seconds - shutdown da requestlarni kutish
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"   # X-Forwarded-* ga ishoniladigan proxylar
+    
+    # ========================================
+    # WARMUP (lifespan startup)
+    # ========================================
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5           # async pool (DB_POOL_SIZE dan oshmaydi)
+    WARMUP_REDIS_CONNECTIONS: int = 5        # har bir Redis client uchun
+    WARMUP_POST_PAGES: int = 1               # cache ga oldindan yoziladigan sahifalar
+    WARMUP_TIMEOUT: float = 10.0             # seconds, har bir qadam uchun
+    
+    # ========================================
+    # HEALTH CHECKS
+    # ========================================
+    HEALTH_CHECK_TIMEOUT: float = 1.0        # seconds, har bir dependency uchun
+    HEALTH_CACHE_TTL: float = 2.0            # seconds - probe storm himoyasi
+    
+    # ========================================
+    # VIEW COUNTERS (write-behind)
+    # ========================================
+    VIEW_FLUSH_INTERVAL: float = 5.0         # seconds - deltalar DB ga shu oraliqda
+    VIEW_FLUSH_BATCH_SIZE: int = 500         # bitta UPDATE dagi postlar
+    VIEW_FLUSH_STOP_TIMEOUT: float = 2.0     # seconds - shutdown dagi oxirgi flush
+    
+    # ========================================
+    # POST INSERT BATCHING (group commit, opt-in)
+    # ========================================
+    POST_BATCH_ENABLED: bool = False
+    POST_BATCH_MAX_SIZE: int = 50            # shuncha yig'ilsa darhol commit
+    POST_BATCH_WINDOW_MS: float = 5.0        # birinchi insertdan keyin kutish
+    
+    # ========================================
+    # BACKGROUND JOBS (write side effects)
+    # ========================================
+    JOB_BACKEND: str = "memory"              # "memory" | "redis" (durable, at-least-once)
+    JOB_QUEUE_SIZE: int = 10000              # to'lsa yangi joblar rad etiladi
+    JOB_WORKERS: int = 4                     # bir vaqtda bajariladigan joblar (har process)
+    JOB_MAX_RETRIES: int = 3
+    JOB_RETRY_BACKOFF: float = 0.5           # seconds, har urinishda 2x
+    JOB_SHUTDOWN_TIMEOUT: float = 10.0       # seconds - shutdown da navbatni kutish
+    JOB_POLL_INTERVAL: float = 0.2           # seconds - redis: bo'sh navbatni tekshirish
+    
+    # ========================================
+    # COMPRESSION
+    # ========================================
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024         # bytes - kichik javoblar siqilmaydi
+    # Server tartibi; br/zstd faqat brotli/zstandard o'rnatilgan bo'lsa
+    COMPRESSION_ENCODINGS: List[str] = ["br", "zstd", "gzip"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # ========================================
+    # METRICS
+    # ========================================
+    # 5-50ms endpointlar uchun zich bucketlar
+    HTTP_LATENCY_BUCKETS: List[float] = [
+        0.001, 0.0025, 0.005, 0.0075, 0.01, 0.015, 0.02, 0.025, 0.03,
+        0.04, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    ]
+    HTTP_SIZE_BUCKETS: List[float] = [
+        100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000,
+    ]
     
     # ========================================
     # PYDANTIC SETTINGS CONFIG
@@ -151,13 +254,36 @@ class Settings(BaseSettings):
         """Check if running in production mode"""
         return self.ENVIRONMENT == "production"
     
+    @property
+    def compression_levels(self) -> dict:
+        """Per-encoding levels for CompressionMiddleware / pre-compressed cache"""
+        return {
+            "gzip": self.COMPRESSION_GZIP_LEVEL,
+            "br": self.COMPRESSION_BROTLI_QUALITY,
+            "zstd": self.COMPRESSION_ZSTD_LEVEL,
+        }
+    
+    @property
+    def is_sqlite(self) -> bool:
+        """SQLite backend (local runs, benchmarks) instead of MySQL"""
+        return self.DATABASE_URL.startswith("sqlite")
+    
     def get_database_url(self, async_driver: bool = False) -> str:
         """Get database URL with optional async driver"""
         if async_driver:
-            return self.DATABASE_URL.replace("mysql+pymysql://", "mysql+aiomysql://")
+            scheme, sep, rest = self.DATABASE_URL.partition("://")
+            return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
         return self.DATABASE_URL
 
 
+# Sync URL scheme -> async driver (get_database_url(async_driver=True))
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
 @lru_cache()
 def get_settings() -> Settings:
     """
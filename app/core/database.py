@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine,text
+import threading
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .db_events import instrument_engine
+from .db_pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -9,48 +13,137 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker
 )
 
-# Settings'dan database URL olish
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    echo=settings.DB_ECHO,
-    pool_pre_ping=True,  # Connection health check
-)
-
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
-
 # ========================================
-# ASYNC ENGINE (YANGI!)
+# ENGINES (lazy - birinchi ishlatilganda yaratiladi)
 # ========================================
-# MySQL URL ni async ga o'zgartirish
-async_database_url = settings.DATABASE_URL.replace(
-    "mysql+pymysql://",
-    "mysql+aiomysql://"
-)
+# Dialect (pymysql / aiomysql) import va pool yaratish import vaqtida emas,
+# lifespan warmup yoki birinchi request da bo'ladi (cold start).
+_engine = None
+_async_engine = None
+# Threadpool (sync) routelar birinchi requestda poyga qilmasin - ikkinchi
+# engine / pool yaratilib yo'qolib ketardi
+_engine_lock = threading.Lock()
+
 
-async_engine = create_async_engine(
-    async_database_url,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    echo=settings.DB_ECHO,
-    pool_pre_ping=True,
+class _LazySessionmaker(sessionmaker):
+    """Creates the sync engine when the first session is opened"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """Creates the async engine when the first session is opened"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_async_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(
+    autocommit=False,
+    autoflush=False,
 )
 
-AsyncSessionLocal = async_sessionmaker(
-    async_engine,
+AsyncSessionLocal = _LazyAsyncSessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+
+# ========================================
+# SQLITE (servissiz backend)
+# ========================================
+# Fayl DB kerak (sqlite:///./blog.db): sync va async engine alohida
+# connection ochadi, :memory: da ular har xil bazani ko'radi.
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL: readerlar writer ni kutmaydi; busy_timeout: lock da xato o'rniga kutish"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def _backend_options(sync_engine) -> None:
+    if settings.is_sqlite:
+        event.listen(sync_engine, "connect", _sqlite_pragmas)
+
+
+def create_tables() -> None:
+    """
+    Create missing tables from the models (SQLite backend only - MySQL uses
+    Alembic migrations). Called from the lifespan startup.
+    """
+    import models.post  # noqa: F401 - Base.metadata ga ro'yxatdan o'tish
+    import models.user  # noqa: F401
+
+    Base.metadata.create_all(get_engine())
+
+
+def get_engine():
+    """Sync engine (created on first call, binds SessionLocal)"""
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is None:
+            engine = create_engine(
+                settings.DATABASE_URL,
+                # SQLite: pool dagi connection boshqa threadda ishlatiladi
+                connect_args={"check_same_thread": False} if settings.is_sqlite else {},
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                echo=settings.DB_ECHO,
+                pool_pre_ping=True,  # Connection health check
+                poolclass=InstrumentedQueuePool,
+                pool_logging_name="sync",
+            )
+            _backend_options(engine)
+            instrument_engine(engine, "sync")
+            SessionLocal.configure(bind=engine)
+            # Oxirida: lock siz o'quvchilar faqat tayyor engine ni ko'radi
+            _engine = engine
+    return _engine
+
+
+def get_async_engine():
+    """Async engine (created on first call, binds AsyncSessionLocal)"""
+    global _async_engine
+    if _async_engine is not None:
+        return _async_engine
+    with _engine_lock:
+        if _async_engine is None:
+            engine = create_async_engine(
+                settings.get_database_url(async_driver=True),
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                echo=settings.DB_ECHO,
+                pool_pre_ping=True,
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                pool_logging_name="async",
+            )
+            _backend_options(engine.sync_engine)
+            instrument_engine(engine.sync_engine, "async")
+            AsyncSessionLocal.configure(bind=engine)
+            _async_engine = engine
+    return _async_engine
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of the engines that were created (shutdown)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
 Base = declarative_base()
 
 
@@ -58,7 +151,7 @@ Base = declarative_base()
 def test_database_connection():
     """Test database connection"""
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             connection.execute(text("SELECT 1"))
         return True
     except Exception as e:
@@ -71,7 +164,7 @@ def test_database_connection():
 async def test_async_database_connection():
     """Test async database connection"""
     try:
-        async with async_engine.connect() as connection:
+        async with get_async_engine().connect() as connection:
             await connection.execute(text("SELECT 1"))
         return True
     except Exception as e:
@@ -87,6 +180,6 @@ if __name__ == "__main__":
     print("DATABASE CONFIGURATION")
     print("=" * 60)
     print(f"Sync URL:  {settings.DATABASE_URL}")
-    print(f"Async URL: {async_database_url}")
+    print(f"Async URL: {settings.get_database_url(async_driver=True)}")
     print(f"Pool size: {settings.DB_POOL_SIZE}")
     print("=" * 60)
\ No newline at end of file
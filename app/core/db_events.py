@@ -0,0 +1,94 @@
+"""
+SQLAlchemy event hooks.
+
+Cursor-level hooks measure every statement the sync and async engines run:
+- Server-Timing ("db") for the current request
+- db_query_duration_seconds histogram by normalized statement
+- slow query log (DB_SLOW_QUERY_THRESHOLD_MS) with the request ID
+- per-request statement count (db_queries_per_request)
+"""
+import logging
+import re
+import time
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+from core.metrics import DB_QUERY_DURATION
+from middleware.request_id import get_current_request_id
+from middleware.timing import query_stats_ctx, server_timing_ctx
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_FORMAT = "[%s] SLOW QUERY (%s) %.1fms: %s"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """
+    Collapse a SQL statement to its shape (literals and params -> ?).
+
+    Example:
+        "SELECT posts.id FROM posts WHERE posts.id = %s LIMIT 10"
+        -> "SELECT posts.id FROM posts WHERE posts.id = ? LIMIT ?"
+    """
+    normalized = _STRING_RE.sub("?", statement)
+    normalized = _PARAM_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (?)", normalized)
+    normalized = _SPACE_RE.sub(" ", normalized).strip()
+    return normalized[:200]
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Attach statement instrumentation to a (sync) engine.
+
+    Usage:
+        instrument_engine(engine, "sync")
+        instrument_engine(async_engine.sync_engine, "async")
+    """
+    slow_threshold = settings.DB_SLOW_QUERY_THRESHOLD_MS / 1000
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        _record(statement, elapsed)
+
+    def handle_error(exception_context):
+        # after_cursor_execute xato bo'lganda chaqirilmaydi
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    def _record(statement: str, elapsed: float) -> None:
+        normalized = normalize_statement(statement)
+        DB_QUERY_DURATION.labels(engine=name, statement=normalized).observe(elapsed)
+
+        stats = query_stats_ctx.get()
+        if stats is not None:
+            stats.count += 1
+            stats.total += elapsed
+
+        timing = server_timing_ctx.get()
+        if timing is not None:
+            timing.add("db", elapsed)
+
+        if elapsed >= slow_threshold:
+            logger.warning(
+                SLOW_QUERY_FORMAT, get_current_request_id(), name, elapsed * 1000, normalized
+            )
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
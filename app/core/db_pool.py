@@ -0,0 +1,78 @@
+"""
+Instrumented connection pools.
+
+Pool classes time every checkout (wait for a free connection or for a new
+overflow connection), count timeouts and refresh the checked-out / idle /
+overflow gauges after each checkout and return. Metrics are labelled with
+the pool's logging name ("sync" / "async"), passed as pool_logging_name.
+
+SQLAlchemy names a pool's logger after its class module, so these pools
+log under core.db_pool.* instead of sqlalchemy.pool.* and miss SQLAlchemy's
+WARN default - it is pinned here (otherwise LOG_LEVEL=INFO logs every
+dispose / recreate and DEBUG every checkout).
+
+Usage:
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_logging_name="sync")
+"""
+import logging
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IDLE,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+)
+
+# SQLAlchemy ning WARN defaulti; pool loggerlari (core.db_pool.<Class>.<name>) meros oladi
+logging.getLogger(__name__).setLevel(logging.WARNING)
+
+
+def _pool_name(pool) -> str:
+    return getattr(pool, "logging_name", None) or "default"
+
+
+class _PoolMetricsMixin:
+    """Times QueuePool._do_get (checkout wait), counts TimeoutError, updates gauges"""
+
+    def _do_get(self):
+        name = _pool_name(self)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(engine=name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(engine=name).observe(time.perf_counter() - start)
+            update_pool_gauges(self)
+
+    def _do_return_conn(self, record):
+        try:
+            super()._do_return_conn(record)
+        finally:
+            update_pool_gauges(self)
+
+
+class InstrumentedQueuePool(_PoolMetricsMixin, QueuePool):
+    """QueuePool for the sync engine"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for the async engine"""
+
+
+def update_pool_gauges(pool) -> None:
+    """Refresh gauges from the pool's counters (QueuePool only)"""
+    if not isinstance(pool, QueuePool):
+        return
+    name = _pool_name(pool)
+    DB_POOL_CHECKED_OUT.labels(engine=name).set(pool.checkedout())
+    DB_POOL_IDLE.labels(engine=name).set(pool.checkedin())
+    DB_POOL_OVERFLOW.labels(engine=name).set(max(0, pool.overflow()))
+    DB_POOL_SIZE.labels(engine=name).set(pool.size())
@@ -2,25 +2,26 @@
 Global exception handlers for FastAPI.
 """
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from datetime import datetime
 import logging
 
+from core.responses import FastJSONResponse
+
 logger = logging.getLogger(__name__)
 
 
 async def validation_exception_handler(
     request: Request,
     exc: RequestValidationError
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     Handle Pydantic validation errors.
     """
     logger.warning(f"Validation error on {request.url.path}: {exc.errors()}")
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -35,7 +36,7 @@ async def validation_exception_handler(
 async def sqlalchemy_exception_handler(
     request: Request,
     exc: SQLAlchemyError
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     Handle SQLAlchemy database errors.
     """
@@ -43,7 +44,7 @@ async def sqlalchemy_exception_handler(
     
     # Check if it's an integrity error (duplicate, foreign key, etc.)
     if isinstance(exc, IntegrityError):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_409_CONFLICT,
             content={
                 "success": False,
@@ -55,7 +56,7 @@ async def sqlalchemy_exception_handler(
         )
     
     # Generic database error
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -70,7 +71,7 @@ async def sqlalchemy_exception_handler(
 async def generic_exception_handler(
     request: Request,
     exc: Exception
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     Handle all other unexpected exceptions.
     """
@@ -79,7 +80,7 @@ async def generic_exception_handler(
         exc_info=True
     )
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
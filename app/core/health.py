@@ -0,0 +1,81 @@
+"""
+Dependency health checks for readiness probes.
+
+Har bir check timeout bilan ishlaydi va natija HEALTH_CACHE_TTL soniya
+cache qilinadi. Bir vaqtda kelgan probelar bitta checkni kutadi
+(single-flight), shuning uchun probe storm DB / Redis ga yuk bermaydi.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from core.config import settings
+from core.database import get_async_engine
+from core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+async def check_database() -> None:
+    # Pool dagi (warm) connection - har probe da yangi TCP ulanish yo'q
+    async with get_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_redis() -> None:
+    # Sync client: PING thread da, event loop bloklanmaydi
+    await asyncio.to_thread(redis_client.ping)
+
+
+CHECKS = {
+    "database": check_database,
+    "redis": check_redis,
+}
+
+
+class ReadinessChecker:
+    """
+    Cached, single-flight dependency checks.
+
+    Usage:
+        checker = ReadinessChecker(timeout=1.0, ttl=2.0)
+        results = await checker.results()   # {"database": "healthy", "redis": "unhealthy"}
+    """
+
+    def __init__(self, timeout: float, ttl: float):
+        self.timeout = timeout
+        self.ttl = ttl
+        self._cached: Optional[Dict[str, str]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run(self, name: str, check) -> str:
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Readiness check {name} failed: {e!r}")
+            return "unhealthy"
+        return "healthy"
+
+    async def results(self) -> Dict[str, str]:
+        if self._cached is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._cached
+        async with self._lock:
+            # Lock ni kutganlar yangi natijani oladi
+            if self._cached is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._cached
+            statuses = await asyncio.gather(
+                *(self._run(name, check) for name, check in CHECKS.items())
+            )
+            self._cached = dict(zip(CHECKS, statuses))
+            self._checked_at = time.monotonic()
+            return self._cached
+
+
+readiness_checker = ReadinessChecker(
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    ttl=settings.HEALTH_CACHE_TTL,
+)
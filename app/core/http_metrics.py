@@ -0,0 +1,76 @@
+"""
+HTTP metrics - Instrumentator hook and /metrics endpoint.
+"""
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.openmetrics.exposition import (
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE,
+    generate_latest as generate_openmetrics,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_RESPONSE_SIZE,
+    cleanup_dead_workers,
+    multiprocess_dir,
+)
+from middleware.request_id import request_id_ctx
+
+
+def observe_http_request(info) -> None:
+    """
+    Instrumentator instrumentation: latency and response size per route template.
+
+    info.modified_handler is the route template ("/api/v1/posts/{post_id}"),
+    so path parameters don't create new series. The request ID becomes an
+    exemplar, linking a latency bucket to the matching log line.
+    """
+    request_id = request_id_ctx.get()
+    exemplar = {"request_id": request_id[:64]} if request_id else None
+
+    HTTP_REQUEST_DURATION.labels(
+        method=info.method,
+        handler=info.modified_handler,
+        status=info.modified_status,
+    ).observe(info.modified_duration, exemplar=exemplar)
+
+    if info.response is not None:
+        content_length = info.response.headers.get("Content-Length")
+        if content_length is not None:
+            HTTP_RESPONSE_SIZE.labels(
+                method=info.method,
+                handler=info.modified_handler,
+            ).observe(int(content_length))
+
+
+def metrics_endpoint(request: Request) -> Response:
+    """
+    /metrics - OpenMetrics (with exemplars) when the scraper asks for it,
+    classic Prometheus text format otherwise.
+
+    Prometheus sends the OpenMetrics Accept header by default; exemplars are
+    stored with --enable-feature=exemplar-storage.
+
+    With PROMETHEUS_MULTIPROC_DIR set, metrics of all workers are aggregated
+    from the shared directory (exemplars are not kept in that mode).
+    """
+    if multiprocess_dir() is not None:
+        cleanup_dead_workers()
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    if "application/openmetrics-text" in request.headers.get("accept", ""):
+        return Response(
+            generate_openmetrics(registry),
+            headers={"Content-Type": OPENMETRICS_CONTENT_TYPE},
+        )
+    return Response(generate_latest(registry), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,406 @@
+"""
+Background job queue for side effects of write endpoints.
+
+Endpoint row commit bo'lgach darhol javob qaytaradi; cache invalidation,
+indexing, hisoblagichlar va h.k. job sifatida navbatga tushadi va fon
+workerlarida bajariladi.
+
+Backends (JOB_BACKEND):
+    memory - bounded asyncio.Queue in this process. Fast, but queued jobs
+             are lost if the process dies; on graceful shutdown the queue
+             is drained for up to JOB_SHUTDOWN_TIMEOUT seconds.
+    redis  - durable list in Redis, shared by all workers (at-least-once).
+             A job is moved atomically to the consumer's processing list
+             while it runs (LMOVE) and removed after it finishes. Jobs left
+             in processing lists of consumers that stopped heartbeating are
+             put back on the queue at startup - handlers must be idempotent.
+
+Retries: a failing job is retried up to JOB_MAX_RETRIES times with
+exponential backoff (JOB_RETRY_BACKOFF * 2^attempt seconds). Rejected
+(queue full / Redis down) and finally failed jobs are logged and counted
+in jobs_processed_total, they do not fail the request.
+
+Usage:
+    @job_queue.job("invalidate_post_pages")
+    def invalidate_post_pages(category=None):
+        ...
+
+    job_queue.enqueue("invalidate_post_pages", category="tech")
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+from core.config import settings
+from core.metrics import JOB_DURATION, JOB_QUEUE_DEPTH, JOBS_ENQUEUED, JOBS_PROCESSED
+from core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+JOB_BACKENDS = ("memory", "redis")
+
+
+class Job:
+    """One queued call: handler name + JSON-serializable kwargs"""
+
+    __slots__ = ("id", "name", "kwargs", "raw")
+
+    def __init__(self, name: str, kwargs: Dict[str, Any], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex   # bir xil payload li joblar LREM da adashmasin
+        self.name = name
+        self.kwargs = kwargs
+        self.raw: Optional[str] = None   # redis: processing list dagi aynan shu qiymat
+
+    def dumps(self) -> str:
+        return orjson.dumps(
+            {"id": self.id, "name": self.name, "kwargs": self.kwargs}
+        ).decode()
+
+    @classmethod
+    def loads(cls, raw: str) -> "Job":
+        data = orjson.loads(raw)
+        job = cls(data["name"], data["kwargs"], data["id"])
+        job.raw = raw
+        return job
+
+
+# ========================================
+# BACKENDS
+# ========================================
+class MemoryJobBackend:
+    """Bounded in-process queue"""
+
+    durable = False
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def start(self) -> None:
+        pass
+
+    async def put(self, job: Job) -> bool:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def get(self) -> Optional[Job]:
+        return await self._queue.get()
+
+    async def ack(self, job: Job) -> None:
+        self._queue.task_done()
+
+    async def heartbeat(self) -> None:
+        pass
+
+    async def drain(self) -> None:
+        await self._queue.join()
+
+    def size(self) -> int:
+        return self._queue.qsize()
+
+
+class RedisJobBackend:
+    """
+    Durable Redis list queue.
+
+    Keys:
+        jobs:queue                    pending jobs (LPUSH in, LMOVE out)
+        jobs:processing:{consumer}    jobs this consumer is running
+        jobs:consumers                set of consumer ids
+        jobs:alive:{consumer}         heartbeat (expires if the process dies)
+    """
+
+    durable = True
+    QUEUE_KEY = "jobs:queue"
+    CONSUMERS_KEY = "jobs:consumers"
+
+    def __init__(self, client, maxsize: int, poll_interval: float = 0.2, heartbeat_ttl: int = 30):
+        self.client = client
+        self.maxsize = maxsize
+        self.poll_interval = poll_interval
+        self.heartbeat_ttl = heartbeat_ttl
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processing_key = f"jobs:processing:{self.consumer}"
+        self._size = 0
+
+    def _alive_key(self, consumer: str) -> str:
+        return f"jobs:alive:{consumer}"
+
+    def _recover(self) -> int:
+        """Requeue jobs of consumers whose heartbeat expired (crashed workers)"""
+        recovered = 0
+        for consumer in self.client.smembers(self.CONSUMERS_KEY):
+            if consumer == self.consumer or self.client.exists(self._alive_key(consumer)):
+                continue
+            processing_key = f"jobs:processing:{consumer}"
+            while self.client.lmove(processing_key, self.QUEUE_KEY, "RIGHT", "RIGHT") is not None:
+                recovered += 1
+            self.client.srem(self.CONSUMERS_KEY, consumer)
+        return recovered
+
+    async def start(self) -> None:
+        await self.heartbeat()
+        await asyncio.to_thread(self.client.sadd, self.CONSUMERS_KEY, self.consumer)
+        recovered = await asyncio.to_thread(self._recover)
+        if recovered:
+            logger.warning(f"Requeued {recovered} jobs from stopped consumers")
+
+    async def put(self, job: Job) -> bool:
+        # Bounded: hajm tekshiruvi + push atomik emas, chegara taxminiy
+        size = await asyncio.to_thread(self.client.llen, self.QUEUE_KEY)
+        if size >= self.maxsize:
+            return False
+        self._size = await asyncio.to_thread(self.client.lpush, self.QUEUE_KEY, job.dumps())
+        return True
+
+    async def get(self) -> Optional[Job]:
+        raw = await asyncio.to_thread(
+            self.client.lmove, self.QUEUE_KEY, self.processing_key, "RIGHT", "LEFT"
+        )
+        if raw is None:
+            # Bo'sh navbat: blocking pop thread ni band qilmasin - polling
+            await asyncio.sleep(self.poll_interval)
+            return None
+        return Job.loads(raw)
+
+    async def ack(self, job: Job) -> None:
+        await asyncio.to_thread(self.client.lrem, self.processing_key, 1, job.raw)
+
+    async def heartbeat(self) -> None:
+        await asyncio.to_thread(
+            self.client.set, self._alive_key(self.consumer), 1, ex=self.heartbeat_ttl
+        )
+        self._size = await asyncio.to_thread(self.client.llen, self.QUEUE_KEY)
+
+    async def drain(self) -> None:
+        # Navbat Redis da qoladi - boshqa worker yoki keyingi start bajaradi
+        pass
+
+    def unregister(self) -> None:
+        """Graceful stop: processing list back to the queue, forget this consumer"""
+        while self.client.lmove(self.processing_key, self.QUEUE_KEY, "RIGHT", "RIGHT") is not None:
+            pass
+        self.client.delete(self._alive_key(self.consumer))
+        self.client.srem(self.CONSUMERS_KEY, self.consumer)
+
+    def size(self) -> int:
+        return self._size
+
+
+# ========================================
+# QUEUE
+# ========================================
+class JobQueue:
+    """
+    Named job handlers + worker pool over a backend.
+
+    Args:
+        backend: "memory" or "redis"
+        maxsize: Queued jobs before enqueue() rejects new ones
+        workers: Jobs run concurrently (per process)
+        max_retries: Retries after the first failed attempt
+        retry_backoff: Base delay in seconds (doubled per attempt)
+        shutdown_timeout: Seconds to wait for queued / running jobs on stop
+        poll_interval: redis - idle workers check the list this often
+    """
+
+    def __init__(
+        self,
+        backend: str = "memory",
+        maxsize: int = 10000,
+        workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        shutdown_timeout: float = 10.0,
+        poll_interval: float = 0.2,
+    ):
+        if backend not in JOB_BACKENDS:
+            raise ValueError(f"backend must be one of {JOB_BACKENDS}")
+        self.backend_name = backend
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Callable] = {}
+        self.backend = None
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._pending: set = set()    # enqueue tasklari (redis: LPUSH davom etmoqda)
+        self._stopping = False
+
+    def job(self, name: str) -> Callable:
+        """Register a handler (async or sync; sync ones run in a thread)"""
+        def register(func: Callable) -> Callable:
+            self.handlers[name] = func
+            return func
+        return register
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        if self.backend_name == "redis":
+            self.backend = RedisJobBackend(redis_client.client, self.maxsize, self.poll_interval)
+        else:
+            self.backend = MemoryJobBackend(self.maxsize)
+        await self.backend.start()
+        self._stopping = False
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)
+        ]
+        if self.backend.durable:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="job-heartbeat")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers, waiting at most shutdown_timeout seconds.
+
+        memory: queued jobs are run first (they exist only in this process).
+        redis:  queued jobs stay in Redis; only running jobs are finished.
+        """
+        if self.backend is None:
+            return
+        deadline = time.monotonic() + self.shutdown_timeout
+        try:
+            if self._pending:
+                await asyncio.wait(self._pending, timeout=self.shutdown_timeout)
+            await asyncio.wait_for(self.backend.drain(), timeout=deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            logger.warning(f"Job queue not drained on shutdown ({self.backend.size()} jobs left)")
+
+        self._stopping = True
+        if self.backend.durable:
+            # Worker joriy jobni tugatib chiqadi (get poll_interval da qaytadi)
+            await asyncio.wait(self._workers, timeout=max(deadline - time.monotonic(), 0))
+        # Bekor qilingan job processing list da qoladi - unregister navbatga qaytaradi
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+        if self.backend.durable:
+            try:
+                await asyncio.to_thread(self.backend.unregister)
+            except Exception as e:
+                # Heartbeat muddati o'tgach boshqa worker start da qaytaradi
+                logger.warning(f"Job consumer not unregistered: {e!r}")
+        self._workers = []
+        self._heartbeat_task = None
+        self.backend = None
+
+    # ---------- producer ----------
+    def enqueue(self, name: str, **kwargs) -> None:
+        """
+        Queue a job and return immediately (kwargs must be JSON-serializable).
+
+        Without a running queue (scripts, start() not called) the job runs
+        in the background of the current loop, so it is not silently skipped.
+
+        Raises:
+            KeyError: If no handler is registered under `name`
+        """
+        if name not in self.handlers:
+            raise KeyError(f"Unknown job: {name}")
+        task = asyncio.get_running_loop().create_task(self._enqueue(Job(name, kwargs)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _enqueue(self, job: Job) -> None:
+        if self.backend is None:
+            await self._run(job)
+            return
+        try:
+            accepted = await self.backend.put(job)
+        except Exception as e:
+            accepted = False
+            logger.error(f"Could not enqueue job {job.name}: {e!r}")
+        if accepted:
+            JOBS_ENQUEUED.labels(job=job.name).inc()
+        else:
+            JOBS_PROCESSED.labels(job=job.name, status="rejected").inc()
+            logger.error(f"Job {job.name} rejected ({self.backend.size()} queued, max {self.maxsize})")
+        JOB_QUEUE_DEPTH.set(self.backend.size())
+
+    # ---------- workers ----------
+    async def _heartbeat(self) -> None:
+        interval = self.backend.heartbeat_ttl / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.backend.heartbeat()
+                JOB_QUEUE_DEPTH.set(self.backend.size())
+            except Exception as e:
+                logger.warning(f"Job queue heartbeat failed: {e!r}")
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            try:
+                job = await self.backend.get()
+            except Exception as e:
+                logger.error(f"Job queue unavailable: {e!r}")
+                await asyncio.sleep(1.0)
+                continue
+            if job is None:
+                continue
+            # Cancel (shutdown timeout) da ack yo'q - redis job processing list da qoladi
+            await self._run(job)
+            try:
+                await self.backend.ack(job)
+            except Exception as e:
+                # Job bajarilgan; processing list da qolsa keyinroq yana bajariladi
+                logger.warning(f"Could not ack job {job.name}: {e!r}")
+            JOB_QUEUE_DEPTH.set(self.backend.size())
+
+    async def _run(self, job: Job) -> None:
+        """
+        Run a job, retrying failures with exponential backoff.
+
+        Retry shu worker ichida kutiladi: redis da job backoff vaqtida ham
+        processing list da turadi, process o'lsa yo'qolmaydi.
+        """
+        handler = self.handlers.get(job.name)
+        if handler is None:
+            logger.error(f"No handler for job {job.name}, dropped")
+            JOBS_PROCESSED.labels(job=job.name, status="failed").inc()
+            return
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    await handler(**job.kwargs)
+                else:
+                    await asyncio.to_thread(handler, **job.kwargs)
+            except Exception as e:
+                JOB_DURATION.labels(job=job.name).observe(time.perf_counter() - started)
+                if attempt == self.max_retries:
+                    JOBS_PROCESSED.labels(job=job.name, status="failed").inc()
+                    logger.error(f"Job {job.name} failed after {attempt + 1} attempts: {e!r}")
+                    return
+                JOBS_PROCESSED.labels(job=job.name, status="retry").inc()
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Job {job.name} failed ({e!r}), retry in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            JOB_DURATION.labels(job=job.name).observe(time.perf_counter() - started)
+            JOBS_PROCESSED.labels(job=job.name, status="success").inc()
+            return
+
+
+job_queue = JobQueue(
+    backend=settings.JOB_BACKEND,
+    maxsize=settings.JOB_QUEUE_SIZE,
+    workers=settings.JOB_WORKERS,
+    max_retries=settings.JOB_MAX_RETRIES,
+    retry_backoff=settings.JOB_RETRY_BACKOFF,
+    shutdown_timeout=settings.JOB_SHUTDOWN_TIMEOUT,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+)
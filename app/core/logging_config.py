@@ -1,19 +1,223 @@
+"""
+Logging setup - non-blocking queue pipeline.
+
+Loggers only put records on a bounded queue (QueueHandler); a background
+QueueListener thread does the actual stdout/file writes with size-based
+rotation. The event loop never waits on disk I/O.
+
+Settings:
+    LOG_LEVEL, LOG_FILE_PATH, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE, LOG_QUEUE_OVERFLOW ("drop" | "block"),
+    LOG_FORMATTER ("text" | "json")
+"""
+import atexit
+import json
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+from core.config import settings
+from core.metrics import LOG_RECORDS_DROPPED
+from middleware.observability import (
+    ACCESS_FORMAT,
+    ACCESS_TIMING_FORMAT,
+    EXCEPTION_FORMAT,
+    SLOW_FORMAT,
+)
+from middleware.request_id import RequestIDLogFilter
+
+try:
+    import orjson
+
+    def _encode(value) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    def _encode(value) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Access log args -> JSON field names (middleware.observability formatlari)
+STRUCTURED_LAYOUTS = {
+    ACCESS_FORMAT: ("request_id", "client_ip", "method", "path", "status", "latency"),
+    ACCESS_TIMING_FORMAT: (
+        "request_id", "client_ip", "method", "path", "status", "latency", "server_timing",
+    ),
+    EXCEPTION_FORMAT: ("request_id", "client_ip", "method", "path", "latency", "error"),
+    SLOW_FORMAT: ("request_id", "method", "path", "latency"),
+}
+
+_listener: Optional[QueueListener] = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler with an overflow policy for a bounded queue.
+
+    drop  - the new record is discarded and counted in log_records_dropped_total
+    block - the caller waits until the listener frees a slot
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        super().__init__(log_queue)
+        self.block = block
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(level=record.levelname).inc()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line, built by string concatenation.
+
+    Static fields (app, version, environment) are encoded once; access log
+    records are expanded from their %-args straight into fields, so no
+    per-record dict is built. Latency is written in milliseconds.
+
+    Example:
+        {"app":"FastAPI Blog API","version":"1.0.0","env":"production",
+         "ts":"2024-02-01T10:30:00.123Z","level":"INFO","logger":"middleware.access",
+         "request_id":"01a1...","msg":"[%s] %s - %s %s - %d - %.3fs",
+         "client_ip":"10.0.0.5","method":"GET","path":"/api/v1/posts/",
+         "status":200,"latency_ms":4.512}
+    """
+
+    def __init__(self, app: str, version: str, environment: str):
+        super().__init__()
+        self._prefix = (
+            f'{{"app":{_encode(app)},"version":{_encode(version)},'
+            f'"env":{_encode(environment)},"ts":"'
+        )
+        self._cached = (-1, "")   # (second, formatted) - bitta tuple, thread-safe
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, cached_ts = self._cached
+        if second != cached_second:
+            cached_ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached = (second, cached_ts)
+        return f"{cached_ts}.{int((created - second) * 1000):03d}Z"
 
-def setup_logging():
-    """Minimal logging setup"""
-    
-    # Create logs directory
-    Path("/app/logs").mkdir(exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("/app/logs/app.log"),
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [
+            self._prefix,
+            self._timestamp(record.created),
+            '","level":"', record.levelname,
+            '","logger":', _encode(record.name),
+            ',"request_id":', _encode(getattr(record, "request_id", None)),
         ]
-    )
\ No newline at end of file
+
+        layout = STRUCTURED_LAYOUTS.get(record.msg) if record.args else None
+        if layout is not None:
+            # Format string o'zi "msg" bo'ladi, qiymatlar alohida fieldlar
+            parts += (',"msg":', _encode(record.msg))
+            for name, value in zip(layout, record.args):
+                if name == "request_id":
+                    continue
+                if name == "latency":
+                    parts.append(f',"latency_ms":{value * 1000:.3f}')
+                elif name == "status":
+                    parts.append(f',"status":{value}')
+                else:
+                    parts += (',"', name, '":', _encode(str(value)))
+        else:
+            parts += (',"msg":', _encode(record.getMessage()))
+
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts += (',"exc":', _encode(record.exc_text))
+
+        parts.append("}")
+        return "".join(parts)
+
+
+def _build_output_handlers(json_output: bool) -> list:
+    """stdout + rotating file handler (file skipped if the directory is not writable)"""
+    # JSON rejimda record QueueHandler da allaqachon to'liq formatlangan
+    formatter = logging.Formatter("%(message)s" if json_output else LOG_FORMAT)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    handlers = [stream_handler]
+
+    try:
+        log_path = Path(settings.LOG_FILE_PATH)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_path,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    except OSError as e:
+        print(f"File logging disabled ({settings.LOG_FILE_PATH}): {e}", file=sys.stderr)
+    else:
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    return handlers
+
+
+def setup_logging() -> QueueListener:
+    """
+    Configure root logger with the queue pipeline (idempotent).
+
+    Returns:
+        Running QueueListener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+    queue_handler = BoundedQueueHandler(
+        log_queue,
+        block=settings.LOG_QUEUE_OVERFLOW == "block",
+    )
+    # Request ID ni chaqiruvchi thread/context da o'qish kerak
+    queue_handler.addFilter(RequestIDLogFilter())
+
+    # QueueHandler.prepare() args ni birlashtiradi, shuning uchun JSON
+    # formatter shu yerda (args hali bor paytda) ishlashi kerak
+    json_output = settings.LOG_FORMATTER == "json"
+    if json_output:
+        queue_handler.setFormatter(
+            JSONFormatter(settings.APP_NAME, settings.APP_VERSION, settings.ENVIRONMENT)
+        )
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(
+        log_queue,
+        *_build_output_handlers(json_output),
+        respect_handler_level=True,
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -0,0 +1,110 @@
+"""
+Event-loop lag monitor.
+
+An asyncio task sleeps for a fixed interval and records how late it wakes
+up (event_loop_lag_seconds). A watchdog thread checks the task's heartbeat;
+if the loop has not run for longer than the threshold, it captures the
+loop thread's current stack - the blocking call itself - and logs it with
+the request ID found in that stack.
+
+Usage:
+    monitor = LoopLagMonitor(interval=0.1, threshold=0.1)
+    await monitor.start()
+    ...
+    await monitor.stop()
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+from middleware.request_id import NO_REQUEST_ID
+
+logger = logging.getLogger(__name__)
+
+STALL_FORMAT = "[%s] EVENT LOOP BLOCKED for %.0fms, blocking stack:\n%s"
+
+
+def find_request_id(frame) -> str:
+    """Nearest `request_id` local in the frame chain (ObservabilityMiddleware sets one)"""
+    while frame is not None:
+        value = frame.f_locals.get("request_id")
+        if isinstance(value, str):
+            return value
+        frame = frame.f_back
+    return NO_REQUEST_ID
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop scheduling lag and reports blocking calls.
+
+    Args:
+        interval: Seconds between heartbeats
+        threshold: Stall duration (seconds) that triggers a stack capture
+        stack_limit: Frames to include in the logged stack
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, stack_limit: int = 25):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            EVENT_LOOP_LAG.observe(max(lag, 0.0))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stopped.wait(self.interval):
+            stalled_for = time.monotonic() - self._heartbeat - self.interval
+            if stalled_for < self.threshold:
+                reported = False
+                continue
+            if reported:
+                # Bitta stall uchun bitta log
+                continue
+            reported = True
+            EVENT_LOOP_STALLS.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=self.stack_limit))
+            logger.warning(STALL_FORMAT, find_request_id(frame), stalled_for * 1000, stack)
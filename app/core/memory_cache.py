@@ -0,0 +1,271 @@
+"""
+In-process cache backend with the redis.Redis interface the app uses.
+
+CACHE_BACKEND=memory bo'lganda core.redis_client Redis o'rniga shuni
+beradi - benchmark, profiling va lokal ishga tushirish servissiz.
+
+Not a general Redis emulator: only get/set/incr/delete/exists, hashes
+(incl. HINCRBY), lists (LPUSH/LMOVE/LREM - job queue), sets, expire, ping
+and pipelines (atomic, like MULTI/EXEC), with TTLs checked lazily on
+access. Values are stored as bytes and decoded like redis-py when
+decode_responses=True; view() gives a client with the other setting over
+the same data (one "server", two connections). Data lives in one
+process, so it is not shared between uvicorn workers.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    return str(value).encode()
+
+
+class MemoryRedis:
+    """
+    Thread-safe dict-backed stand-in for redis.Redis.
+
+    Usage:
+        client = MemoryRedis(decode_responses=True)
+        client.set("key", "value", ex=60)
+        client.get("key")   # "value"
+        client.view(decode_responses=False).get("key")   # b"value"
+    """
+
+    def __init__(self, decode_responses: bool = False):
+        self.decode_responses = decode_responses
+        self._data: Dict[str, object] = {}
+        self._expires: Dict[str, float] = {}
+        # Sync client: route handlerlar thread pool da chaqiradi
+        self._lock = threading.RLock()
+
+    def view(self, decode_responses: bool) -> "MemoryRedis":
+        """Client over the same data and lock, differing only in decoding"""
+        other = MemoryRedis(decode_responses=decode_responses)
+        other._data, other._expires, other._lock = self._data, self._expires, self._lock
+        return other
+
+    def _decode(self, value):
+        if value is None or not self.decode_responses:
+            return value
+        return value.decode()
+
+    def _alive(self, key) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    # ---------- strings ----------
+    def get(self, key):
+        with self._lock:
+            if not self._alive(key):
+                return None
+            return self._decode(self._data[key])
+
+    def set(self, key, value, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[key] = _to_bytes(value)
+            self._expires.pop(key, None)
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+            return True
+
+    def incr(self, key, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._data[key]) + amount if self._alive(key) else amount
+            self._data[key] = _to_bytes(value)
+            return value
+
+    def exists(self, *keys) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._alive(key))
+
+    def delete(self, *keys) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                # SMEMBERS (bytes client) dan kelgan kalitlar - Redis da bir xil
+                key = key.decode() if isinstance(key, bytes) else key
+                if self._alive(key):
+                    removed += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    # ---------- hashes ----------
+    def hset(self, key, field=None, value=None, mapping=None) -> int:
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = {}
+            items = dict(mapping or {})
+            if field is not None:
+                items[field] = value
+            hash_ = self._data[key]
+            added = sum(1 for f in items if _to_bytes(f) not in hash_)
+            for f, v in items.items():
+                hash_[_to_bytes(f)] = _to_bytes(v)
+            return added
+
+    def hmget(self, key, fields) -> List:
+        with self._lock:
+            hash_ = self._data[key] if self._alive(key) else {}
+            return [self._decode(hash_.get(_to_bytes(f))) for f in fields]
+
+    def hincrby(self, key, field, amount: int = 1) -> int:
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = {}
+            hash_ = self._data[key]
+            field = _to_bytes(field)
+            value = int(hash_.get(field, b"0")) + amount
+            hash_[field] = _to_bytes(value)
+            return value
+
+    def hgetall(self, key) -> Dict:
+        with self._lock:
+            if not self._alive(key):
+                return {}
+            return {self._decode(f): self._decode(v) for f, v in self._data[key].items()}
+
+    def hdel(self, key, *fields) -> int:
+        with self._lock:
+            if not self._alive(key):
+                return 0
+            hash_ = self._data[key]
+            removed = sum(1 for f in fields if hash_.pop(_to_bytes(f), None) is not None)
+            if not hash_:
+                self.delete(key)
+            return removed
+
+    # ---------- lists ----------
+    def _list(self, key, create: bool = False) -> Optional[deque]:
+        if not self._alive(key):
+            if not create:
+                return None
+            self._data[key] = deque()
+        return self._data[key]
+
+    def lpush(self, key, *values) -> int:
+        with self._lock:
+            items = self._list(key, create=True)
+            for value in values:
+                items.appendleft(_to_bytes(value))
+            return len(items)
+
+    def llen(self, key) -> int:
+        with self._lock:
+            items = self._list(key)
+            return len(items) if items is not None else 0
+
+    def lmove(self, first_list, second_list, src: str = "LEFT", dest: str = "RIGHT"):
+        with self._lock:
+            source = self._list(first_list)
+            if not source:
+                return None
+            value = source.popleft() if src.upper() == "LEFT" else source.pop()
+            if not source:
+                self.delete(first_list)
+            target = self._list(second_list, create=True)
+            if dest.upper() == "LEFT":
+                target.appendleft(value)
+            else:
+                target.append(value)
+            return self._decode(value)
+
+    def lrem(self, key, count: int, value) -> int:
+        with self._lock:
+            items = self._list(key)
+            if items is None:
+                return 0
+            value = _to_bytes(value)
+            kept = deque()
+            removed = 0
+            for item in items:
+                if item == value and (count == 0 or removed < abs(count)):
+                    removed += 1
+                else:
+                    kept.append(item)
+            if kept:
+                self._data[key] = kept
+            else:
+                self.delete(key)
+            return removed
+
+    # ---------- sets ----------
+    def sadd(self, key, *values) -> int:
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = set()
+            members = self._data[key]
+            added = {_to_bytes(v) for v in values} - members
+            members |= added
+            return len(added)
+
+    def srem(self, key, *values) -> int:
+        with self._lock:
+            if not self._alive(key):
+                return 0
+            members = self._data[key]
+            removed = {_to_bytes(v) for v in values} & members
+            members -= removed
+            if not members:
+                self.delete(key)
+            return len(removed)
+
+    def smembers(self, key) -> Set:
+        with self._lock:
+            if not self._alive(key):
+                return set()
+            return {self._decode(v) for v in self._data[key]}
+
+    # ---------- keys ----------
+    def expire(self, key, seconds, nx: bool = False) -> bool:
+        with self._lock:
+            if not self._alive(key) or (nx and key in self._expires):
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def flushall(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    """Queues commands and runs them under the client lock on execute()"""
+
+    def __init__(self, client: MemoryRedis):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List:
+        commands, self._commands = self._commands, []
+        with self._client._lock:
+            return [method(*args, **kwargs) for method, args, kwargs in commands]
@@ -0,0 +1,240 @@
+"""
+Custom Prometheus metrics.
+
+All metric names live here and are exposed on the same /metrics endpoint
+(core/http_metrics.py). HTTP latency/size histograms are fed by
+Instrumentator through core.http_metrics.observe_http_request.
+
+Multi-worker mode:
+    Set the PROMETHEUS_MULTIPROC_DIR environment variable (before start) and
+    every worker writes its metrics to mmap files in that directory; /metrics
+    aggregates all of them. Gauges use "livesum" so dead workers drop out.
+"""
+import os
+import re
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram, multiprocess
+
+from core.config import settings
+
+_PID_FILE_RE = re.compile(r"_(\d+)\.db$")
+
+# ========================================
+# HTTP
+# ========================================
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status class",
+    ["method", "handler", "status"],
+    buckets=settings.HTTP_LATENCY_BUCKETS,
+)
+
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by method and route template",
+    ["method", "handler"],
+    buckets=settings.HTTP_SIZE_BUCKETS,
+)
+
+# ========================================
+# LOGGING
+# ========================================
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+    ["level"],
+)
+
+
+# ========================================
+# DATABASE
+# ========================================
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency by engine and normalized statement",
+    ["engine", "statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+
+
+# ========================================
+# CONNECTION POOL
+# ========================================
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle_connections",
+    "Connections idle in the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Overflow connections in use (beyond pool_size)",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pool connection (includes connecting overflow)",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that failed with pool TimeoutError",
+    ["engine"],
+)
+
+
+# ========================================
+# EVENT LOOP
+# ========================================
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the loop monitor",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Event loop stalls longer than LOOP_LAG_THRESHOLD",
+)
+
+
+# ========================================
+# VIEW COUNTERS (write-behind)
+# ========================================
+POST_VIEWS_FLUSHED = Counter(
+    "post_views_flushed_total",
+    "Post views written to the database by the write-behind flusher",
+)
+
+POST_VIEW_FLUSH_DURATION = Histogram(
+    "post_view_flush_duration_seconds",
+    "Time to write one batch of aggregated view deltas",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+POST_VIEW_FLUSH_FAILURES = Counter(
+    "post_view_flush_failures_total",
+    "Flush batches that failed (deltas are put back into the counter hash)",
+)
+
+
+# ========================================
+# POST INSERT BATCHING (group commit)
+# ========================================
+POST_INSERT_BATCH_SIZE = Histogram(
+    "post_insert_batch_size",
+    "Posts committed together by the insert batcher",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+POST_INSERT_BATCH_DURATION = Histogram(
+    "post_insert_batch_duration_seconds",
+    "Time to commit one insert batch (including one-by-one fallback)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+POST_INSERT_BATCH_FALLBACKS = Counter(
+    "post_insert_batch_fallbacks_total",
+    "Batches whose transaction failed and were retried one insert at a time",
+)
+
+
+# ========================================
+# BACKGROUND JOBS
+# ========================================
+JOBS_ENQUEUED = Counter(
+    "jobs_enqueued_total",
+    "Jobs accepted by the job queue",
+    ["job"],
+)
+
+JOBS_PROCESSED = Counter(
+    "jobs_processed_total",
+    "Job outcomes (success, retry, failed, rejected = queue full or unavailable)",
+    ["job", "status"],
+)
+
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Time spent in one job attempt",
+    ["job"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+JOB_QUEUE_DEPTH = Gauge(
+    "job_queue_depth",
+    "Jobs waiting to run (memory: this worker's queue, redis: the shared list)",
+    multiprocess_mode="livemax",
+)
+
+
+
+# ========================================
+# MULTIPROCESS HELPERS
+# ========================================
+def multiprocess_dir() -> Optional[str]:
+    """Shared metrics directory, or None in single-process mode"""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_dead_workers() -> None:
+    """
+    Drop live-gauge files of workers that no longer exist (crashed or
+    restarted). Counter/histogram files are kept so totals never go back.
+    """
+    path = multiprocess_dir()
+    if path is None:
+        return
+    dead = set()
+    for name in os.listdir(path):
+        match = _PID_FILE_RE.search(name)
+        if match and name.startswith("gauge_live"):
+            pid = int(match.group(1))
+            if pid not in dead and not _pid_alive(pid):
+                dead.add(pid)
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, path)
+
+
+def mark_worker_dead() -> None:
+    """Remove this worker's live gauges on graceful shutdown"""
+    path = multiprocess_dir()
+    if path is not None:
+        multiprocess.mark_process_dead(os.getpid(), path)
@@ -0,0 +1,174 @@
+"""
+On-demand per-request profiling.
+
+A background thread samples the event-loop thread's stack every few
+milliseconds while one selected request is in flight and writes the
+samples as a collapsed-stack file (flamegraph.pl / speedscope / inferno
+format) under PROFILE_DIR. Only the newest PROFILE_MAX_FILES files are
+kept. File names are {ts}-{route}-{hash of request id}.folded - the request
+id may come from the client, so it is logged, not put in the name as-is.
+
+A request is profiled when:
+- it sends "X-Profile: 1" together with a valid X-Admin-Token, or
+- it is picked by PROFILE_SAMPLE_RATE.
+
+Only one request is profiled at a time. Other requests running on the same
+loop at that moment also show up in the samples.
+
+Usage:
+    profiler = RequestProfiler(directory="/app/profiles", admin_token="secret")
+    app.add_middleware(ObservabilityMiddleware, profiler=profiler)
+"""
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from starlette.types import Scope
+
+from middleware.observability import get_header, is_admin_request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+MAX_ROUTE_LABEL = 64
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples one thread's stack until stopped, then writes collapsed stacks.
+
+    Output line format (root first, count last):
+        run (runners.py:86);_run_once (base_events.py:1845);get_posts (post.py:24) 17
+    """
+
+    def __init__(
+        self,
+        target_thread_id: int,
+        interval: float,
+        output_path: Path,
+        request_id: str = "",
+        max_files: int = 0,
+    ):
+        super().__init__(name="request-profiler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.output_path = output_path
+        self.request_id = request_id
+        self.max_files = max_files
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        labels = {}
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+        self._write()
+
+    def stop(self) -> None:
+        # Fayl yozish shu thread da - event loop disk I/O kutmaydi
+        self._stop_event.set()
+
+    def _write(self) -> None:
+        try:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error(f"Could not write profile {self.output_path}: {e}")
+            return
+        logger.info(
+            f"Profile written: {self.output_path} "
+            f"({sum(self.samples.values())} samples, request_id={self.request_id})"
+        )
+        if self.max_files:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond max_files (disk chegarasiz o'smasin)"""
+        try:
+            files = sorted(
+                self.output_path.parent.glob("*.folded"),
+                key=lambda path: path.stat().st_mtime,
+            )
+            for path in files[:-self.max_files]:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not prune old profiles: {e}")
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and runs a StackSampler around them.
+
+    Args:
+        directory: Where .folded files are written
+        sample_rate: Fraction of requests profiled without the header (0 = off)
+        admin_token: Required X-Admin-Token for "X-Profile: 1" (empty = header disabled)
+        interval: Sampling interval in seconds
+        max_files: Newest profiles kept in `directory` (0 = no limit)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        admin_token: str = "",
+        interval: float = 0.005,
+        max_files: int = 100,
+    ):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token
+        self.interval = interval
+        self.max_files = max_files
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        return get_header(scope, PROFILE_HEADER) == "1" and is_admin_request(
+            scope, self.admin_token
+        )
+
+    def start(self, scope: Scope, request_id: str) -> Optional[StackSampler]:
+        """Start sampling if this request is selected and no profile is running"""
+        if not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            return None
+        route = scope["path"].strip("/").replace("/", "_")
+        route = _UNSAFE_CHARS.sub("_", route)[:MAX_ROUTE_LABEL] or "root"
+        # X-Request-ID client dan kelishi mumkin (128 belgigacha) - nomda faqat hash
+        digest = hashlib.sha1(request_id.encode()).hexdigest()[:12]
+        output_path = self.directory / f"{int(time.time())}-{route}-{digest}.folded"
+        sampler = StackSampler(
+            threading.get_ident(), self.interval, output_path, request_id, self.max_files,
+        )
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler) -> None:
+        sampler.stop()
+        self._busy.release()
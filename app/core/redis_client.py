@@ -1,9 +1,131 @@
-import redis
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
 from core.config import settings
+from middleware.timing import server_timing_ctx
+
+if TYPE_CHECKING:
+    import redis
+
+
+class TimedRedis:
+    """
+    Redis client proxy that adds every command's duration to the
+    request's Server-Timing as "cache".
+
+    Attribute access is forwarded to the wrapped client; when timing is off
+    for the request the only extra cost is one contextvar lookup.
+
+    The client is built by `factory` on first use, so `import redis` is not
+    paid at app import time.
+    """
+
+    def __init__(self, factory: Callable[[], "redis.Redis"]):
+        self._factory = factory
+        self._client: Optional["redis.Redis"] = None
+
+    @property
+    def client(self) -> "redis.Redis":
+        if self._client is None:
+            self._client = self._factory()
+        return self._client
+
+    def close(self) -> None:
+        """Close the connection pool (no-op if the client was never used)"""
+        if self._client is not None:
+            self._client.close()
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def timed_command(*args, **kwargs):
+            timing = server_timing_ctx.get()
+            if timing is None:
+                return attr(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                timing.add("cache", time.perf_counter() - start)
+
+        return timed_command
+
+
+_memory_store = None
+_memory_store_lock = threading.Lock()
+
+
+def _memory_view(decode_responses: bool) -> "redis.Redis":
+    """
+    View of the one in-process store - redis_client va redis_bytes_client
+    bitta Redis server dagi kabi bir xil kalitlarni ko'radi.
+    """
+    global _memory_store
+    from core.memory_cache import MemoryRedis
+
+    with _memory_store_lock:
+        if _memory_store is None:
+            _memory_store = MemoryRedis()
+    return _memory_store.view(decode_responses)
+
+
+def _connect(decode_responses: bool) -> "redis.Redis":
+    """Client for settings.CACHE_BACKEND ("redis" or in-process "memory")"""
+    if settings.CACHE_BACKEND == "memory":
+        return _memory_view(decode_responses)
+
+    import redis  # lazy: birinchi Redis buyrug'ida
+
+    if settings.REDIS_URL:
+        return redis.Redis.from_url(settings.REDIS_URL, decode_responses=decode_responses)
+    return redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        decode_responses=decode_responses
+    )
+
 
 # Redis connection
-redis_client = redis.Redis(
-    host='redis',
-    port=6379,
-    decode_responses=True
-)
\ No newline at end of file
+redis_client = TimedRedis(lambda: _connect(decode_responses=True))
+
+# Binary qiymatlar uchun (siqilgan cache sahifalari) - decode qilinmaydi
+redis_bytes_client = TimedRedis(lambda: _connect(decode_responses=False))
+
+
+# ========================================
+# TRACKED CACHE KEYS (invalidation SCAN siz)
+# ========================================
+def track_key(pipe, set_key: str, key: str, ttl: int) -> None:
+    """
+    Queue SADD + EXPIRE on `pipe`: remember a cache key under `set_key`.
+
+    The set's TTL is refreshed on every add, so it outlives the keys it
+    lists (their TTL is at most `ttl`).
+    """
+    pipe.sadd(set_key, key)
+    pipe.expire(set_key, ttl)
+
+
+def delete_tracked(client, set_keys: Iterable[str], chunk: int = 500) -> int:
+    """
+    Delete every key remembered under `set_keys` (and the sets).
+
+    Cost is the number of tracked keys, not the keyspace size. SMEMBERS + DEL
+    of each set runs as one transaction - a key tracked meanwhile goes to a
+    fresh set instead of being dropped untracked.
+    """
+    pipe = client.pipeline(transaction=True)
+    for set_key in set_keys:
+        pipe.smembers(set_key)
+        pipe.delete(set_key)
+    results = pipe.execute()
+    keys = list(set().union(*results[::2]))
+    deleted = 0
+    for start in range(0, len(keys), chunk):
+        deleted += client.delete(*keys[start:start + chunk])
+    return deleted
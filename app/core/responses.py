@@ -0,0 +1,54 @@
+"""
+Response classes.
+
+FastJSONResponse encodes with orjson instead of the stdlib json module:
+datetimes, UUIDs and dataclasses natively, Pydantic models via model_dump.
+
+As default_response_class it only replaces the final json.dumps - when a
+route returns a dict / list / model, FastAPI still runs jsonable_encoder
+(and response_model validation) before render(). Routes on the hot path
+return FastJSONResponse(...) themselves: a returned Response is sent as-is,
+so the encoder pass is skipped too (benchmarks/bench_json_response.py).
+"""
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from middleware.timing import timed
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not know (Pydantic models, Decimal, ORM objects...)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content the same way FastJSONResponse does.
+
+    Usage:
+        redis_client.set(cache_key, dumps(posts_data), ex=60)
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-backed JSONResponse; encoding time is reported in Server-Timing ("render").
+
+    Used as the app's default_response_class and by core.error_handlers.
+
+    Usage:
+        return FastJSONResponse({"created_at": datetime.utcnow(), "post": post_schema})
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed("render"):
+            return dumps(content)
@@ -0,0 +1,204 @@
+"""
+Sampled, anonymized traffic capture for replay (benchmarks/replay.py).
+
+Tanlangan requestlar JSONL qatoriga aylanadi va alohida bounded queue
+orqali fon thread da faylga yoziladi (logging pipeline bilan bir xil:
+event loop disk I/O kutmaydi, queue to'lsa record tashlab yuboriladi).
+
+One line per request:
+    {"ts": 1718000000.123, "method": "POST", "route": "/api/v1/posts/",
+     "path": "/api/v1/posts/", "query": "skip=0&limit=20", "status": 201,
+     "latency_ms": 12.4, "auth": true, "content_type": "application/json",
+     "accept_encoding": "gzip, br", "body": {"title": "...", "content": "..."}}
+
+Anonymization:
+- no client IP, cookies, tokens or other headers; only "auth": true/false,
+  content type and accept-encoding (they pick the cache / compression path)
+- values of SENSITIVE_FIELDS in JSON bodies and query strings are replaced
+  with REDACTED (nested objects included)
+- bodies over max_body bytes or not JSON are dropped ("body": null)
+
+Usage:
+    capture = TrafficCapture("/app/logs/traffic-{pid}.jsonl", sample_rate=0.01)
+    app.add_middleware(ObservabilityMiddleware, capture=capture)
+    capture.start()   # lifespan startup
+    capture.stop()    # lifespan shutdown
+"""
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+import orjson
+from starlette.types import Message, Receive, Scope
+
+from middleware.observability import get_header
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "<redacted>"
+SENSITIVE_FIELDS = frozenset({
+    "password", "email", "full_name", "token", "access_token", "refresh_token", "secret",
+})
+AUTHORIZATION_HEADER = b"authorization"
+CONTENT_TYPE_HEADER = b"content-type"
+ACCEPT_ENCODING_HEADER = b"accept-encoding"
+
+
+def redact(value):
+    """Copy of a decoded JSON value with sensitive fields replaced"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.lower() in SENSITIVE_FIELDS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def redact_query(query: str) -> str:
+    if not query:
+        return ""
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return urlencode([
+        (key, REDACTED if key.lower() in SENSITIVE_FIELDS else value) for key, value in pairs
+    ])
+
+
+class CapturedRequest:
+    """Body chunks of one sampled request (collected by the receive wrapper)"""
+
+    __slots__ = ("started", "chunks", "size", "truncated")
+
+    def __init__(self):
+        self.started = time.time()
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.truncated = False
+
+
+class TrafficCapture:
+    """
+    Picks requests with probability sample_rate and writes them as JSONL.
+
+    Args:
+        path: Output file; "{pid}" is replaced with the worker PID so
+            uvicorn workers never rotate each other's files
+        sample_rate: Fraction of requests captured
+        max_body: Largest request body kept, in bytes
+        queue_size: Pending lines before new ones are dropped
+        max_bytes / backup_count: Size-based rotation
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 0.01,
+        max_body: int = 4096,
+        queue_size: int = 10000,
+        max_bytes: int = 10485760,
+        backup_count: int = 5,
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_body = max_body
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._listener: Optional[QueueListener] = None
+
+    # ---------- writer ----------
+    def start(self) -> None:
+        """Open the output file and start the writer thread (idempotent)"""
+        if self._listener is not None:
+            return
+        path = Path(self.path.format(pid=os.getpid()))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8",
+            )
+        except OSError as e:
+            print(f"Traffic capture disabled ({path}): {e}", file=sys.stderr)
+            self.sample_rate = 0.0
+            return
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        logger.info(f"Traffic capture: {path} (sample rate {self.sample_rate})")
+
+    def stop(self) -> None:
+        """Flush pending lines and close the file"""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        if self.dropped:
+            logger.warning(f"Traffic capture dropped {self.dropped} requests (queue full)")
+
+    # ---------- request path ----------
+    def begin(self, receive: Receive):
+        """
+        Sample the request. Returns (CapturedRequest, wrapped receive) when
+        selected, otherwise (None, receive) unchanged.
+        """
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None, receive
+        entry = CapturedRequest()
+
+        async def capturing_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request" and not entry.truncated:
+                body = message.get("body", b"")
+                entry.size += len(body)
+                if entry.size > self.max_body:
+                    entry.truncated = True
+                    entry.chunks.clear()
+                elif body:
+                    entry.chunks.append(body)
+            return message
+
+        return entry, capturing_receive
+
+    def _body(self, scope: Scope, entry: CapturedRequest):
+        if entry.truncated or not entry.chunks:
+            return None
+        content_type = get_header(scope, CONTENT_TYPE_HEADER) or ""
+        if "json" not in content_type:
+            return None
+        try:
+            return redact(orjson.loads(b"".join(entry.chunks)))
+        except orjson.JSONDecodeError:
+            return None
+
+    def finish(
+        self, entry: CapturedRequest, scope: Scope, route: str, status_code: int, latency: float,
+    ) -> None:
+        record = {
+            "ts": round(entry.started, 6),
+            "method": scope["method"],
+            "route": route,
+            "path": scope["path"],
+            "query": redact_query(scope.get("query_string", b"").decode("latin-1")),
+            "status": status_code,
+            "latency_ms": round(latency * 1000, 3),
+            "auth": get_header(scope, AUTHORIZATION_HEADER) is not None,
+            "content_type": get_header(scope, CONTENT_TYPE_HEADER),
+            "accept_encoding": get_header(scope, ACCEPT_ENCODING_HEADER),
+            "body": self._body(scope, entry),
+        }
+        line = logging.makeLogRecord({"msg": orjson.dumps(record).decode(), "levelno": logging.INFO})
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
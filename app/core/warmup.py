@@ -0,0 +1,119 @@
+"""
+Startup warmup - connection pools and hot cache pages.
+
+Lifespan startup da ishlaydi: birinchi requestlar TCP / auth handshake
+yoki bo'sh cache uchun to'lamasin. Har bir qadam xatosi faqat log
+qilinadi - warmup ishlamasa ham app ishga tushadi (readiness check
+keyin haqiqiy holatni ko'rsatadi).
+
+Settings:
+    WARMUP_ENABLED, WARMUP_DB_CONNECTIONS, WARMUP_REDIS_CONNECTIONS,
+    WARMUP_POST_PAGES, WARMUP_TIMEOUT
+"""
+import asyncio
+import logging
+import time
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+from core.database import AsyncSessionLocal, get_async_engine
+from core.redis_client import redis_bytes_client, redis_client
+from services import post_cache
+
+if TYPE_CHECKING:
+    import redis
+
+logger = logging.getLogger(__name__)
+
+# Ro'yxat endpointining default sahifa hajmi (GET /api/v1/posts/)
+PAGE_LIMIT = 100
+
+
+async def warm_db_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open `connections` pool connections at once, run SELECT 1 on each and
+    return them to the pool, where they stay idle and ready.
+
+    Capped at DB_POOL_SIZE - overflow connections are closed on checkin.
+    """
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return 0
+
+    async def open_one():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    results = await asyncio.gather(*(open_one() for _ in range(connections)), return_exceptions=True)
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    errors = [e for e in results if isinstance(e, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(opened)
+
+
+def warm_redis_pool(client: "redis.Redis", connections: int) -> int:
+    """Connect and PING `connections` pooled Redis connections (blocking - run in a thread)"""
+    # In-process backend (CACHE_BACKEND=memory) da pool yo'q
+    pool = getattr(client, "connection_pool", None)
+    if pool is None or connections <= 0:
+        return 0
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = pool.get_connection()
+            opened.append(conn)
+            conn.send_command("PING")
+            conn.read_response()
+    finally:
+        for conn in opened:
+            pool.release(conn)
+    return len(opened)
+
+
+async def preload_post_pages(pages: int) -> int:
+    """Render the first `pages` post list pages into the pre-compressed cache"""
+    async with AsyncSessionLocal() as db:
+        for page in range(pages):
+            skip = page * PAGE_LIMIT
+            body = await post_cache.build_page(db, skip, PAGE_LIMIT)
+            await asyncio.to_thread(post_cache.preload_page, post_cache.page_key(skip, PAGE_LIMIT), body)
+    return pages
+
+
+async def _step(name: str, coro) -> None:
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(coro, timeout=settings.WARMUP_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Warmup {name} failed: {e!r}")
+        return
+    logger.info(f"Warmup {name}: {result} in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+async def warmup() -> None:
+    """
+    Run all warmup steps concurrently (pools), then preload cache pages.
+
+    Usage (lifespan):
+        await warmup()
+        app.state.ready = True
+    """
+    await asyncio.gather(
+        _step("db pool", warm_db_pool(get_async_engine(), settings.WARMUP_DB_CONNECTIONS)),
+        _step("redis pool", asyncio.to_thread(
+            warm_redis_pool, redis_client.client, settings.WARMUP_REDIS_CONNECTIONS
+        )),
+        _step("redis bytes pool", asyncio.to_thread(
+            warm_redis_pool, redis_bytes_client.client, settings.WARMUP_REDIS_CONNECTIONS
+        )),
+    )
+    if settings.WARMUP_POST_PAGES > 0:
+        await _step("post pages", preload_post_pages(settings.WARMUP_POST_PAGES))
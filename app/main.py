@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -6,33 +9,41 @@ from sqlalchemy.exc import SQLAlchemyError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
 
 from core.config import settings
-from core.logging_config import setup_logging
+from core.database import create_tables, dispose_engines
+from core.redis_client import redis_bytes_client, redis_client
+from core.http_metrics import metrics_endpoint, observe_http_request
+from core.jobs import job_queue
+from core.metrics import cleanup_dead_workers, mark_worker_dead
+from core.responses import FastJSONResponse
+from core.logging_config import setup_logging, shutdown_logging
+from core.loop_monitor import LoopLagMonitor
+from core.profiling import RequestProfiler
+from core.traffic_capture import TrafficCapture
+from core.warmup import warmup
+from services.post_batcher import post_batcher
+from services.view_counter import ViewCounterFlusher
 from core.error_handlers import (
     validation_exception_handler,
     sqlalchemy_exception_handler,
     generic_exception_handler
 )
+from api import health
 from api.v1.routes import post as post_v1, auth
 from api.v2.routes import post as post_v2
 
 # ========================================
 # ⚡ MIDDLEWARE IMPORTS (YANGI!)
 # ========================================
-from middleware import (
-    RequestIDMiddleware,
-    TimingMiddleware,
-    LoggingMiddleware
-)
+from middleware import CompressionMiddleware, ObservabilityMiddleware
 
 import logging
 
 # ========================================
-# SETUP LOGGING
+# LOGGING (setup_logging lifespan da - import vaqtida fayl I/O yo'q)
 # ========================================
-setup_logging()
 logger = logging.getLogger(__name__)
 
 # ========================================
@@ -40,6 +51,94 @@ logger = logging.getLogger(__name__)
 # ========================================
 limiter = Limiter(key_func=get_remote_address)
 
+# ========================================
+# EVENT LOOP MONITOR
+# ========================================
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    threshold=settings.LOOP_LAG_THRESHOLD,
+)
+
+# ========================================
+# VIEW COUNTERS (write-behind flush)
+# ========================================
+view_flusher = ViewCounterFlusher(
+    interval=settings.VIEW_FLUSH_INTERVAL,
+    batch_size=settings.VIEW_FLUSH_BATCH_SIZE,
+    stop_timeout=settings.VIEW_FLUSH_STOP_TIMEOUT,
+)
+
+# ========================================
+# TRAFFIC CAPTURE (benchmarks/replay.py)
+# ========================================
+traffic_capture = TrafficCapture(
+    path=settings.TRAFFIC_CAPTURE_PATH,
+    sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE,
+    max_body=settings.TRAFFIC_CAPTURE_MAX_BODY,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    max_bytes=settings.LOG_MAX_BYTES,
+    backup_count=settings.LOG_BACKUP_COUNT,
+) if settings.TRAFFIC_CAPTURE_ENABLED else None
+
+# ========================================
+# LIFESPAN (startup / shutdown)
+# ========================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ---------- STARTUP ----------
+    app.state.ready = False
+    setup_logging()
+    logger.info("=" * 60)
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info(f"Debug mode: {settings.DEBUG}")
+    logger.info("⚡ Middleware enabled:")
+    logger.info("  - ObservabilityMiddleware ✅")
+    logger.info("=" * 60)
+
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+    if traffic_capture is not None:
+        traffic_capture.start()
+
+    # SQLite backend: migratsiyalar MySQL uchun - jadvallar modellardan
+    if settings.is_sqlite:
+        await asyncio.to_thread(create_tables)
+
+    # Multi-worker: oldingi (o'lgan) workerlarning gauge fayllarini tozalash
+    cleanup_dead_workers()
+
+    # Pool lar va hot sahifalar - birinchi requestlar handshake kutmasin
+    if settings.WARMUP_ENABLED:
+        await warmup()
+    await view_flusher.start()
+    if settings.POST_BATCH_ENABLED:
+        await post_batcher.start()
+    # Handlerlar services.post_jobs da (routes import qiladi)
+    await job_queue.start()
+    app.state.ready = True
+
+    yield
+
+    # ---------- SHUTDOWN ----------
+    app.state.ready = False
+    logger.info(f"Shutting down {settings.APP_NAME}")
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+    if traffic_capture is not None:
+        traffic_capture.stop()
+    # Oxirgi flush - engine yopilishidan oldin
+    await post_batcher.stop()
+    # Navbatdagi side effectlar - cache/Redis yopilishidan oldin
+    await job_queue.stop()
+    await view_flusher.stop()
+    await dispose_engines()
+    redis_client.close()
+    redis_bytes_client.close()
+    mark_worker_dead()
+    # Oxirida: yuqoridagi loglar ham queue dan yozilib bo'lsin
+    shutdown_logging()
+
 # ========================================
 # CREATE APP (FAQAT BIR MARTA!)
 # ========================================
@@ -47,9 +146,16 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
-Instrumentator().instrument(app).expose(app)
+# HTTP metrics: route template labels, tuned buckets, request ID exemplars
+instrumentator = Instrumentator(excluded_handlers=["/metrics"])
+instrumentator.add(metrics.requests())
+instrumentator.add(observe_http_request)
+instrumentator.instrument(app)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 # ========================================
 # LIMITER
@@ -73,14 +179,33 @@ app.add_exception_handler(Exception, generic_exception_handler)
 # ⚡ MIDDLEWARE (YANGI!)
 # Tartib MUHIM: birinchi qo'shilgan oxirgi ishlaydi
 # ========================================
-# 1. Request ID - eng birinchi bo'lishi kerak
-app.add_middleware(RequestIDMiddleware)
-
-# 2. Timing - request ID dan keyin
-app.add_middleware(TimingMiddleware)
+# Javob siqish (ObservabilityMiddleware ichida - headerlar siqilgan javobga qo'shiladi)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=settings.COMPRESSION_ENCODINGS,
+        levels=settings.compression_levels,
+    )
 
-# 3. Logging - oxirida (request ID va timing dan foydalanadi)
-app.add_middleware(LoggingMiddleware)
+# Request ID + timing + access log - bitta pure ASGI o'tish
+app.add_middleware(
+    ObservabilityMiddleware,
+    slow_request_threshold=settings.SLOW_REQUEST_THRESHOLD,
+    trust_incoming_request_id=settings.TRUST_INCOMING_REQUEST_ID,
+    access_log_sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    server_timing=settings.SERVER_TIMING,
+    server_timing_sample_rate=settings.SERVER_TIMING_SAMPLE_RATE,
+    admin_token=settings.ADMIN_TOKEN,
+    capture=traffic_capture,
+    profiler=RequestProfiler(
+        directory=settings.PROFILE_DIR,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        admin_token=settings.ADMIN_TOKEN,
+        interval=settings.PROFILE_INTERVAL,
+        max_files=settings.PROFILE_MAX_FILES,
+    ) if settings.PROFILING_ENABLED else None,
+)
 
 # ========================================
 # CORS (MIDDLEWARE hisoblanadi)
@@ -96,6 +221,7 @@ app.add_middleware(
 # ========================================
 # ROUTERS
 # ========================================
+app.include_router(health.router)
 app.include_router(post_v1.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(post_v2.router, prefix="/api/v2")
@@ -111,38 +237,3 @@ def read_root():
         "environment": settings.ENVIRONMENT,
         "status": "running"
     }
-
-# ========================================
-# HEALTH CHECK
-# ========================================
-@app.get("/health")
-def health_check():
-    from core.database import test_database_connection
-    db_status = "healthy" if test_database_connection() else "unhealthy"
-    return {
-        "status": "healthy" if db_status == "healthy" else "degraded",
-        "database": db_status,
-        "environment": settings.ENVIRONMENT
-    }
-
-# ========================================
-# STARTUP EVENT
-# ========================================
-@app.on_event("startup")
-async def startup_event():
-    logger.info("=" * 60)
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info("⚡ Middleware enabled:")
-    logger.info("  - RequestIDMiddleware ✅")
-    logger.info("  - TimingMiddleware ✅")
-    logger.info("  - LoggingMiddleware ✅")
-    logger.info("=" * 60)
-
-# ========================================
-# SHUTDOWN EVENT
-# ========================================
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info(f"Shutting down {settings.APP_NAME}")
\ No newline at end of file
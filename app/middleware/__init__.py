@@ -1,12 +1,10 @@
 """
 Middleware package for request processing.
 """
-from .request_id import RequestIDMiddleware
-from .timing import TimingMiddleware
-from .logging import LoggingMiddleware
+from .compression import CompressionMiddleware
+from .observability import ObservabilityMiddleware
 
 __all__ = [
-    "RequestIDMiddleware",
-    "TimingMiddleware", 
-    "LoggingMiddleware",
-]
\ No newline at end of file
+    "CompressionMiddleware",
+    "ObservabilityMiddleware",
+]
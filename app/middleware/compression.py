@@ -0,0 +1,233 @@
+"""
+Compression Middleware - javoblarni gzip / br / zstd bilan siqadi.
+
+Vazifasi:
+- Accept-Encoding negotiation (q-qiymatlar, server tartibi)
+- Minimal hajmdan kichik javoblar siqilmaydi (COMPRESSION_MIN_SIZE)
+- Allaqachon Content-Encoding li javoblar (masalan cache dagi tayyor
+  siqilgan sahifa) o'zgarishsiz o'tadi
+
+Foyda:
+- Pure ASGI, streaming: har bir body chunk darhol siqilib yuboriladi
+- brotli / zstandard o'rnatilmagan bo'lsa faqat gzip ishlatiladi
+"""
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .observability import get_header
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional (pip install brotli)
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional (pip install zstandard)
+    zstandard = None
+
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+# Matn ko'rinishidagi javoblar; text/event-stream (SSE) buferlanmasligi kerak
+COMPRESSIBLE_TYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/xml", "text/javascript",
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+
+# ========================================
+# STREAM COMPRESSORS
+# ========================================
+class GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+STREAMS = {"gzip": GzipStream}
+if brotli is not None:
+    STREAMS["br"] = BrotliStream
+if zstandard is not None:
+    STREAMS["zstd"] = ZstdStream
+
+
+def available_encodings(preferred: Sequence[str]) -> Tuple[str, ...]:
+    """Configured encodings that are actually installed, in server preference order"""
+    return tuple(encoding for encoding in preferred if encoding in STREAMS)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    One-shot compression (pre-compressed cache entries).
+
+    Usage:
+        body = compress(json_bytes, "gzip")
+    """
+    if level is None:
+        level = DEFAULT_LEVELS[encoding]
+    return STREAMS[encoding](level).finish(data)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: Optional[str], supported: Tuple[str, ...]) -> Optional[str]:
+    """
+    Pick the best encoding from an Accept-Encoding header.
+
+    Highest q wins; ties go to the server order in `supported`.
+    None means identity (no compression).
+
+    Example:
+        negotiate_encoding("gzip, br;q=0.9", ("br", "gzip"))  ->  "gzip"
+    """
+    if not accept_encoding or not supported:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI response compression.
+
+    Usage:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=1024,
+            encodings=["br", "zstd", "gzip"],
+            levels={"gzip": 6, "br": 4, "zstd": 3},
+        )
+
+    Single-body responses smaller than minimum_size are sent as-is;
+    streaming responses are always compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[str] = ("br", "zstd", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(get_header(scope, b"accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, stream, passthrough
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                # Qaror birinchi body chunk da (hajm va more_body kerak)
+                start_message = message
+                return
+
+            if passthrough or message_type != "http.response.body":
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                passthrough = True
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None:
+                headers = MutableHeaders(scope=start_message)
+                if (
+                    "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                    or (not more_body and len(body) < max(self.minimum_size, 1))
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                stream = STREAMS[encoding](self.levels[encoding])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                    body = stream.chunk(body)
+                else:
+                    body = stream.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+            else:
+                body = stream.chunk(body) if more_body else stream.finish(body)
+
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,279 @@
+"""
+Observability Middleware - request ID, timing va access log bitta joyda.
+
+Vazifasi:
+- Har bir requestga unique ID beradi (X-Request-ID)
+- Processing vaqtini o'lchaydi (X-Process-Time)
+- Har bir requestni log qiladi
+- Sekin requestlarni ogohlantiradi
+- Server-Timing: cache / db / render vaqtlari (ixtiyoriy)
+
+Foyda:
+- Pure ASGI: BaseHTTPMiddleware kabi task, body-stream wrapper yo'q
+- Streaming response backpressure buzilmaydi
+- Uchta middleware o'rniga bitta o'tish (bitta timer, bitta send wrapper)
+"""
+import hmac
+import logging
+import random
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import DB_QUERIES_PER_REQUEST
+
+from .request_id import request_id_ctx, resolve_request_id
+from .timing import QueryStats, ServerTiming, query_stats_ctx, server_timing_ctx
+
+access_logger = logging.getLogger("middleware.access")
+
+# Lazy %-style formatlar: args faqat record yozilganda birlashtiriladi
+STARTED_FORMAT = "[%s] %s - %s %s - Started"
+ACCESS_FORMAT = "[%s] %s - %s %s - %d - %.3fs"
+ACCESS_TIMING_FORMAT = "[%s] %s - %s %s - %d - %.3fs - %s"
+EXCEPTION_FORMAT = "[%s] %s - %s %s - EXCEPTION - %.3fs - %s"
+SLOW_FORMAT = "[%s] SLOW REQUEST: %s %s took %.3fs"
+
+# Server-Timing rejimlari
+SERVER_TIMING_MODES = ("off", "all", "sampled", "admin")
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+
+def get_route_template(scope: Scope) -> str:
+    """
+    Matched route template ("/api/v1/posts/{post_id}") - low-cardinality label.
+
+    Depending on the FastAPI version scope["route"].path is either the full
+    template or relative to the include_router prefix, so the static prefix
+    is recovered from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope["path"]
+    regex = route.path_regex
+    if regex.match(path):
+        return template
+    index = path.find("/", 1)
+    while index != -1:
+        if regex.match(path[index:]):
+            return path[:index] + template
+        index = path.find("/", index + 1)
+    return template
+
+
+def get_header(scope: Scope, name: bytes) -> Optional[str]:
+    """First value of a raw ASGI header (name must be lowercase bytes)"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def is_admin_request(scope: Scope, admin_token: str) -> bool:
+    """X-Admin-Token matches the configured token (empty token = disabled)"""
+    if not admin_token:
+        return False
+    token = get_header(scope, ADMIN_TOKEN_HEADER)
+    return token is not None and hmac.compare_digest(token, admin_token)
+
+
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware: request ID + timing headers + access logging.
+
+    Usage:
+        app.add_middleware(
+            ObservabilityMiddleware,
+            slow_request_threshold=1.0,
+            trust_incoming_request_id=True,
+            access_log_sample_rate=0.1,
+            server_timing="admin",
+            admin_token="secret",
+        )
+
+    Adds headers:
+        X-Request-ID: Upstream X-Request-ID / traceparent trace-id, or a new UUIDv7
+        X-Process-Time: Time in seconds until response headers were sent
+        Server-Timing: cache/db/render breakdown, only when server_timing
+            is "all", "sampled" (server_timing_sample_rate) or "admin"
+            (X-Admin-Token header); timed requests are always access-logged
+
+    Profiling:
+        profiler=core.profiling.RequestProfiler(...) samples selected
+        requests into collapsed-stack files; None costs one check.
+
+    Traffic capture:
+        capture=core.traffic_capture.TrafficCapture(...) writes sampled,
+        anonymized requests as JSONL for benchmarks/replay.py.
+
+    Logs format:
+        INFO [req-id] IP - METHOD PATH - STATUS CODE - TIME
+
+    Sampling:
+        4xx/5xx and slow requests are always logged; other responses only
+        with probability access_log_sample_rate. "Started" lines are DEBUG.
+
+    Example:
+        INFO [a1b2c3] 127.0.0.1 - GET /api/v1/posts - 200 - 0.045s
+        ERROR [d4e5f6] 192.168.1.5 - POST /api/v1/auth/login - 500 - 0.012s
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_threshold: float = 1.0,
+        trust_incoming_request_id: bool = True,
+        access_log_sample_rate: float = 1.0,
+        server_timing: str = "off",
+        server_timing_sample_rate: float = 0.01,
+        admin_token: str = "",
+        profiler=None,
+        capture=None,
+    ) -> None:
+        if server_timing not in SERVER_TIMING_MODES:
+            raise ValueError(f"server_timing must be one of {SERVER_TIMING_MODES}")
+        self.app = app
+        self.slow_request_threshold = slow_request_threshold
+        self.trust_incoming_request_id = trust_incoming_request_id
+        self.access_log_sample_rate = access_log_sample_rate
+        self._log_all_success = access_log_sample_rate >= 1.0
+        self.server_timing = server_timing
+        self.server_timing_sample_rate = server_timing_sample_rate
+        self.admin_token = admin_token
+        # core.profiling.RequestProfiler yoki None (o'chirilgan = bitta tekshiruv)
+        self.profiler = profiler
+        # core.traffic_capture.TrafficCapture yoki None
+        self.capture = capture
+
+    def _should_time(self, scope: Scope) -> bool:
+        mode = self.server_timing
+        if mode == "off":
+            return False
+        if mode == "all":
+            return True
+        if mode == "sampled":
+            return random.random() < self.server_timing_sample_rate
+        return is_admin_request(scope, self.admin_token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 1. Request ID (contextvar va request.state.request_id orqali o'qiladi)
+        request_id = resolve_request_id(scope["headers"], self.trust_incoming_request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_ctx.set(request_id)
+
+        # 2. Server-Timing (faqat tanlangan requestlar uchun)
+        timing = ServerTiming() if self._should_time(scope) else None
+        timing_token = server_timing_ctx.set(timing)
+
+        # 3. SQL statement soni (db_queries_per_request)
+        query_stats = QueryStats()
+        stats_token = query_stats_ctx.set(query_stats)
+
+        # 4. Profiling (admin header yoki sampling)
+        sampler = self.profiler.start(scope, request_id) if self.profiler is not None else None
+
+        # 5. Traffic capture (sampling; tanlanganda body ham yig'iladi)
+        captured = None
+        if self.capture is not None:
+            captured, receive = self.capture.begin(receive)
+        try:
+            await self._handle(scope, receive, send, request_id, timing, captured)
+        finally:
+            if sampler is not None:
+                self.profiler.finish(sampler)
+            DB_QUERIES_PER_REQUEST.labels(route=get_route_template(scope)).observe(
+                query_stats.count
+            )
+            query_stats_ctx.reset(stats_token)
+            server_timing_ctx.reset(timing_token)
+            request_id_ctx.reset(token)
+
+    async def _handle(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        request_id: str,
+        timing: Optional[ServerTiming],
+        captured=None,
+    ) -> None:
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        method = scope["method"]
+        path = scope["path"]
+
+        if access_logger.isEnabledFor(logging.DEBUG):
+            access_logger.debug(STARTED_FORMAT, request_id, client_ip, method, path)
+
+        # 6. Timer
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                elapsed = time.perf_counter() - start_time
+                headers.append("X-Process-Time", f"{elapsed:.3f}")
+                if timing is not None:
+                    headers.append("Server-Timing", timing.header_value(total=elapsed))
+            await send(message)
+
+        # 7. Process request
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            process_time = time.perf_counter() - start_time
+            if captured is not None:
+                self.capture.finish(captured, scope, get_route_template(scope), 500, process_time)
+            access_logger.exception(
+                EXCEPTION_FORMAT, request_id, client_ip, method, path, process_time, e
+            )
+            raise
+
+        # 8. Access log (response to'liq yuborilgandan keyin)
+        process_time = time.perf_counter() - start_time
+        slow = process_time > self.slow_request_threshold
+        if captured is not None:
+            self.capture.finish(captured, scope, get_route_template(scope), status_code, process_time)
+
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400:
+            level = logging.WARNING
+        else:
+            # Xatolar va sekin requestlar doim, qolganlari sampling bilan
+            if (
+                not slow
+                and timing is None
+                and not self._log_all_success
+                and random.random() >= self.access_log_sample_rate
+            ):
+                return
+            level = logging.INFO
+
+        # Format faqat log haqiqatan yoziladigan bo'lsa (lazy %-args)
+        if access_logger.isEnabledFor(level):
+            if timing is None:
+                access_logger.log(
+                    level, ACCESS_FORMAT, request_id, client_ip, method, path, status_code, process_time
+                )
+            else:
+                access_logger.log(
+                    level, ACCESS_TIMING_FORMAT, request_id, client_ip, method, path,
+                    status_code, process_time, timing.header_value(),
+                )
+
+        # 9. Slow requests
+        if slow and access_logger.isEnabledFor(logging.WARNING):
+            access_logger.warning(SLOW_FORMAT, request_id, method, path, process_time)
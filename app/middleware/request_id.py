@@ -1,65 +1,139 @@
 """
-Request ID Middleware - Har bir requestga unique ID beradi.
+Request ID - Har bir requestga unique ID.
 
 Vazifasi:
-- Har bir requestga UUID generate qiladi
-- Request.state ga saqlab qo'yadi
-- Response headerga qo'shadi
-- Logging uchun ishlatiladi
+- Upstream (load balancer) yuborgan X-Request-ID / traceparent ni qabul qilish
+- Yo'q bo'lsa tez, vaqt bo'yicha tartiblangan ID generate qilish (UUIDv7)
+- ID ni contextvar ga saqlash (logger va service lar request.state siz o'qiydi)
 
 Foyda:
 - Loglarni kuzatish oson
-- Debugging oson  
+- Load balancer va app loglari bitta ID bilan bog'lanadi
 - Production da muammolarni tezda topish
 """
-import uuid
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Iterable, Optional, Tuple
+
 from starlette.requests import Request
 
 logger = logging.getLogger(__name__)
 
+NO_REQUEST_ID = "no-request-id"
+
+# Joriy request ID (ObservabilityMiddleware set qiladi)
+request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Qabul qilinadigan upstream ID lar
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+_TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$")
+_ZERO_TRACE_ID = "0" * 32
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+
+# ========================================
+# GENERATE
+# ========================================
+def generate_request_id() -> str:
     """
-    Middleware to add unique request ID to each request.
-    
-    Usage:
-        app.add_middleware(RequestIDMiddleware)
-    
-    Example:
-        Request comes in → Generate UUID → Add to request.state → Add to response header
+    Generate a time-ordered UUIDv7-style ID.
+
+    48-bit millisecond timestamp + 74 random bits from the process PRNG
+    (no os.urandom syscall), so IDs sort by creation time.
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        # 1. Generate unique request ID
-        request_id = str(uuid.uuid4())
-        
-        # 2. Save to request.state (har joydan access qilish uchun)
-        request.state.request_id = request_id
-        
-        # 3. Process request
-        response = await call_next(request)
-        
-        # 4. Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+    value = (
+        (time.time_ns() // 1_000_000) << 80
+        | 0x7 << 76                          # version 7
+        | random.getrandbits(12) << 64
+        | 0b10 << 62                         # RFC 4122 variant
+        | random.getrandbits(62)
+    )
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 # ========================================
-# QANDAY ISHLATISH (HELPER FUNCTION)
+# INCOMING
+# ========================================
+def parse_incoming_request_id(value: str) -> Optional[str]:
+    """Validate an incoming X-Request-ID header value"""
+    if _REQUEST_ID_RE.match(value):
+        return value
+    return None
+
+
+def parse_traceparent(value: str) -> Optional[str]:
+    """Extract the trace-id from a W3C traceparent header"""
+    match = _TRACEPARENT_RE.match(value.strip())
+    if match and match.group(1) != _ZERO_TRACE_ID:
+        return match.group(1)
+    return None
+
+
+def resolve_request_id(headers: Iterable[Tuple[bytes, bytes]], trust_incoming: bool = True) -> str:
+    """
+    Pick the request ID for raw ASGI headers.
+
+    X-Request-ID wins over traceparent; invalid values are ignored and a
+    new ID is generated instead.
+    """
+    if trust_incoming:
+        traceparent = None
+        for name, value in headers:
+            if name == b"x-request-id":
+                request_id = parse_incoming_request_id(value.decode("latin-1"))
+                if request_id:
+                    return request_id
+            elif name == b"traceparent":
+                traceparent = value
+        if traceparent is not None:
+            trace_id = parse_traceparent(traceparent.decode("latin-1"))
+            if trace_id:
+                return trace_id
+    return generate_request_id()
+
+
 # ========================================
+# QANDAY ISHLATISH (HELPER FUNCTIONS)
+# ========================================
+def get_current_request_id() -> str:
+    """
+    Get request ID of the request being processed (contextvar).
+
+    Usage:
+        from middleware.request_id import get_current_request_id
+
+        logger.info(f"[{get_current_request_id()}] Fetching posts...")
+    """
+    return request_id_ctx.get() or NO_REQUEST_ID
+
+
 def get_request_id(request: Request) -> str:
     """
     Get request ID from request state.
-    
+
     Usage:
         from middleware.request_id import get_request_id
-        
+
         @router.get("/posts")
         def get_posts(request: Request):
             request_id = get_request_id(request)
             logger.info(f"[{request_id}] Fetching posts...")
     """
-    return getattr(request.state, "request_id", "no-request-id")
\ No newline at end of file
+    return getattr(request.state, "request_id", NO_REQUEST_ID)
+
+
+class RequestIDLogFilter(logging.Filter):
+    """
+    Add `request_id` attribute to every log record.
+
+    Usage:
+        handler.addFilter(RequestIDLogFilter())
+        # format: "%(asctime)s [%(request_id)s] %(message)s"
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_ctx.get() or NO_REQUEST_ID
+        return True
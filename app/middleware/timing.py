@@ -1,65 +1,135 @@
 """
-Timing Middleware - Request processing vaqtini o'lchaydi.
+Timing - Request processing vaqtini o'lchaydi.
 
 Vazifasi:
-- Request qancha vaqt olgani
-- Response headerga qo'shadi
-- Prometheus metrics uchun
-- Slow endpoints topish
+- X-Process-Time headerini o'qish uchun helperlar
+- Per-request Server-Timing konteksti: cache, db, render vaqtlari
+- Header ni ObservabilityMiddleware qo'shadi
 
 Foyda:
-- Performance monitoring
-- Bottleneck topish
-- Optimization kerakli joylarni aniqlash
+- Sekin request da aybdor aniq: Redis, MySQL yoki JSON encoding
+- Browser DevTools Server-Timing ni o'zi ko'rsatadi
 """
-import time
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
-class TimingMiddleware(BaseHTTPMiddleware):
+# ========================================
+# SERVER-TIMING CONTEXT
+# ========================================
+class ServerTiming:
+    """
+    Accumulated durations of one request, grouped by metric name.
+
+    Example header:
+        Server-Timing: cache;dur=0.412;desc="2 calls", db;dur=3.100;desc="1 calls"
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self) -> None:
+        # name -> [total seconds, calls]
+        self.entries: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.entries.get(name)
+        if entry is None:
+            self.entries[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def header_value(self, total: Optional[float] = None) -> str:
+        parts = [
+            f'{name};dur={seconds * 1000:.3f};desc="{int(calls)} calls"'
+            for name, (seconds, calls) in self.entries.items()
+        ]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(parts)
+
+
+# None = bu request uchun timing yoqilmagan (record_timing hech narsa qilmaydi)
+server_timing_ctx: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """
+    Add a duration to the current request's Server-Timing (no-op if disabled).
+
+    Usage:
+        start = time.perf_counter()
+        value = redis_client.get(key)
+        record_timing("cache", time.perf_counter() - start)
+    """
+    timing = server_timing_ctx.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
     """
-    Middleware to measure request processing time.
-    
+    Measure a block into the current request's Server-Timing.
+
     Usage:
-        app.add_middleware(TimingMiddleware)
-    
-    Adds headers:
-        X-Process-Time: Time in seconds (float)
-    
-    Example:
-        GET /api/v1/posts
-        Response Headers:
-            X-Process-Time: 0.045
-            X-Request-ID: a1b2c3d4...
+        with timed("render"):
+            body = json.dumps(data)
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        # 1. Start timer
-        start_time = time.time()
-        
-        # 2. Process request
-        response = await call_next(request)
-        
-        # 3. Calculate processing time
-        process_time = time.time() - start_time
-        
-        # 4. Add to response headers (seconds)
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
-        
-        # 5. Log slow requests (> 1 second)
-        if process_time > 1.0:
-            request_id = getattr(request.state, "request_id", "unknown")
-            logger.warning(
-                f"[{request_id}] SLOW REQUEST: "
-                f"{request.method} {request.url.path} "
-                f"took {process_time:.3f}s"
-            )
-        
-        return response
+    timing = server_timing_ctx.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+# ========================================
+# QUERY STATS (har doim yoqilgan)
+# ========================================
+class QueryStats:
+    """SQL statements executed by one request (N+1 detection)"""
+
+    __slots__ = ("count", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+
+
+query_stats_ctx: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def get_query_count() -> int:
+    """Number of SQL statements the current request has executed so far"""
+    stats = query_stats_ctx.get()
+    return stats.count if stats is not None else 0
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Count SQL statements executed inside a block.
+
+    Usage (tests):
+        with count_queries() as stats:
+            await post_service.get_posts(db)
+        assert stats.count == 1
+    """
+    stats = QueryStats()
+    token = query_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_ctx.reset(token)
 
 
 # ========================================
@@ -68,10 +138,10 @@ class TimingMiddleware(BaseHTTPMiddleware):
 def get_process_time(response) -> float:
     """
     Get process time from response headers.
-    
+
     Usage:
         process_time = get_process_time(response)
         if process_time > 0.5:
             logger.warning("Slow request!")
     """
-    return float(response.headers.get("X-Process-Time", 0))
\ No newline at end of file
+    return float(response.headers.get("X-Process-Time", 0))
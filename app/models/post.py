@@ -1,10 +1,17 @@
 # app/models/post.py
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Index, Integer, String, Text
 from core.database import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # v2 feed: WHERE category = ? AND id < ? ORDER BY id DESC - index range scan
+        Index("ix_posts_category_id", "category", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
+    category = Column(String(50), nullable=True)
+    # services.view_counter batch bilan yozadi (har o'qishda UPDATE emas)
+    views = Column(Integer, nullable=False, default=0, server_default="0")
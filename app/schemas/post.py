@@ -1,11 +1,18 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 class PostCreate(BaseModel):
     title: str
     content: str
+    category: Optional[str] = Field(default=None, max_length=50)
 
 class PostResponse(PostCreate):
     id: int
 
     class Config:
         orm_mode = True
+
+
+class PostV2Response(PostResponse):
+    views: int = 0
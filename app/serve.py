@@ -0,0 +1,138 @@
+"""
+Server entry point - production (multi-worker) va development (--reload).
+
+Production:
+- Worker soni: WEB_CONCURRENCY yoki CPU soni (cgroup limiti hisobga olinadi),
+  MAX_WORKERS bilan cheklangan; CACHE_BACKEND=memory da doim 1
+- uvloop + httptools (o'rnatilgan bo'lsa, uvicorn[standard])
+- App workerlar ishga tushishidan oldin bir marta import qilinadi:
+  config / import xatolari darhol ko'rinadi
+- Keep-alive va listen backlog settings dan
+- Bir nechta worker da Prometheus multiprocess rejimi avtomatik yoqiladi
+
+Usage:
+    python serve.py             # production
+    python serve.py --dev       # bitta process, kod o'zgarsa reload
+"""
+import argparse
+import importlib.util
+import logging
+import math
+import os
+import shutil
+from pathlib import Path
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from core.config import settings
+
+APP = "main:app"
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_MULTIPROC_DIR = "/tmp/prometheus_multiproc"
+
+logger = logging.getLogger("serve")
+
+
+def cpu_limit() -> int:
+    """CPUs this process may use: affinity mask and cgroup v2 quota (Docker --cpus)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def worker_count() -> int:
+    workers = settings.WEB_CONCURRENCY or cpu_limit()
+    workers = max(1, min(workers, settings.MAX_WORKERS))
+    if settings.CACHE_BACKEND == "memory" and workers > 1:
+        # Har worker o'z cache ini ko'radi - invalidation boshqalarga yetmaydi
+        logger.warning(f"CACHE_BACKEND=memory is per-process: running 1 worker instead of {workers}")
+        return 1
+    return workers
+
+
+def fastest_available(candidate: str, module: str, fallback: str) -> str:
+    return candidate if importlib.util.find_spec(module) is not None else fallback
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """
+    Empty PROMETHEUS_MULTIPROC_DIR before workers start (stale files from a
+    previous run would be summed). Must run before prometheus_client is imported.
+    """
+    if workers > 1:
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", DEFAULT_MULTIPROC_DIR)
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def run_dev() -> None:
+    uvicorn.run(
+        APP,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        reload=True,
+        reload_dirs=[str(APP_DIR)],
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+def run_production() -> None:
+    workers = worker_count()
+
+    prepare_metrics_dir(workers)
+
+    # Parent process loglari ham queue pipeline orqali (prometheus env dan keyin)
+    from core.logging_config import setup_logging
+
+    setup_logging()
+
+    # Preload: import xatolari workerlar restart loop ga tushishidan oldin chiqadi
+    import_from_string(APP)
+
+    loop = fastest_available("uvloop", "uvloop", "asyncio")
+    http = fastest_available("httptools", "httptools", "h11")
+    logger.info(
+        f"Starting {workers} worker(s) on {settings.SERVER_HOST}:{settings.SERVER_PORT} "
+        f"(loop={loop}, http={http}, keep-alive={settings.SERVER_KEEPALIVE}s, "
+        f"backlog={settings.SERVER_BACKLOG})"
+    )
+
+    uvicorn.run(
+        APP,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        # Access log ObservabilityMiddleware da; uvicorn loggerlari root ga o'tadi
+        access_log=False,
+        log_config=None,
+        log_level=settings.LOG_LEVEL.lower(),
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--dev", action="store_true", help="single process with --reload")
+    args = parser.parse_args()
+
+    if args.dev:
+        run_dev()
+    else:
+        run_production()
@@ -1,9 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-import bcrypt
 import logging
 
 from models.user import User
@@ -23,6 +21,8 @@ logger = logging.getLogger(__name__)
 # ========================================
 def hash_password(password: str) -> str:
     """Hash password with bcrypt"""
+    import bcrypt  # lazy: faqat register/login da kerak (cold start)
+
     password_bytes = password.encode("utf-8")
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
@@ -31,6 +31,8 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
+    import bcrypt
+
     password_bytes = password.encode("utf-8")
     hashed_bytes = hashed_password.encode("utf-8")
     return bcrypt.checkpw(password_bytes, hashed_bytes)
@@ -41,6 +43,8 @@ def verify_password(password: str, hashed_password: str) -> bool:
 # ========================================
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
+    from jose import jwt  # lazy: jose + cryptography backend import qimmat
+
     to_encode = data.copy()
 
     # Token expiration time
@@ -62,6 +66,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_access_token(token: str) -> dict:
     """Decode and verify JWT token"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
@@ -0,0 +1,135 @@
+"""
+v2 feed cache - per-category keyset pages.
+
+Har bir sahifa (kategoriya, cursor, limit) uchun bitta JSON qiymat:
+    feed:{all|cat:<category>}:{cursor|head}:{limit} -> {"items": [...], "next_cursor": 41}
+
+Sahifada views yo'q - u har 5s flush da o'zgaradi va sahifani eskirtirardi.
+Javobdagi son o'qish vaqtida qo'shiladi (view_counter.current_views: DB
+qiymati + yozilmagan delta), sahifa faqat post yozilganda eskiradi.
+
+Sahifa kalitlari feed_pages:{all|cat:<category>} va feed_pages:every to'plamlarida
+turadi - post yozilganda faqat ta'sirlangan sahifalar o'chiriladi.
+
+Redis ishlamasa sahifa DB dan o'qiladi (500 emas).
+"""
+import asyncio
+import logging
+from typing import List, Optional
+from urllib.parse import quote
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.redis_client import delete_tracked, redis_bytes_client, track_key
+from core.responses import dumps
+from middleware.timing import timed
+from services import post_service, view_counter
+
+logger = logging.getLogger(__name__)
+
+PAGE_TTL = 60  # seconds - create/delete da services.post_jobs tozalaydi
+ALL_PAGES_KEY = "feed_pages:every"
+
+
+def _scope(category: Optional[str]) -> str:
+    """
+    Key segment for a category filter.
+
+    "all" (no filter) va "cat:..." hech qachon ustma-ust tushmaydi - bo'sh
+    yoki "*" kategoriya filtrsiz feed kalitini ololmaydi; quote ":" ni ham
+    kodlaydi.
+    """
+    return "all" if category is None else f"cat:{quote(category, safe='')}"
+
+
+def feed_key(category: Optional[str], cursor: Optional[int], limit: int) -> str:
+    return f"feed:{_scope(category)}:{cursor or 'head'}:{limit}"
+
+
+def pages_key(category: Optional[str]) -> str:
+    """Set of cached page keys of one category (None = unfiltered feed)"""
+    return f"feed_pages:{_scope(category)}"
+
+
+def _serialize(posts) -> List[dict]:
+    return [
+        {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "category": post.category,
+        }
+        for post in posts
+    ]
+
+
+async def _cached_page(key: str) -> Optional[dict]:
+    try:
+        cached = await asyncio.to_thread(redis_bytes_client.get, key)
+    except Exception as e:
+        logger.warning(f"Feed cache unavailable, reading from DB: {e!r}")
+        return None
+    if cached is None:
+        return None
+    with timed("render"):
+        return orjson.loads(cached)
+
+
+def _write_page(key: str, body: bytes, category: Optional[str]) -> None:
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    pipe.set(key, body, ex=PAGE_TTL)
+    track_key(pipe, pages_key(category), key, PAGE_TTL)
+    track_key(pipe, ALL_PAGES_KEY, key, PAGE_TTL)
+    pipe.execute()
+
+
+async def _store_page(key: str, page: dict, category: Optional[str]) -> None:
+    try:
+        await asyncio.to_thread(_write_page, key, dumps(page), category)
+    except Exception as e:
+        logger.warning(f"Feed page not cached: {e!r}")
+
+
+def invalidate_pages(category: Optional[str] = None, everything: bool = False) -> int:
+    """
+    Drop cached pages a post write can change.
+
+    Args:
+        category: Category of the new post (its pages + the unfiltered feed)
+        everything: Every category (post deleted, category unknown)
+    """
+    if everything:
+        set_keys = [ALL_PAGES_KEY]
+    else:
+        set_keys = [pages_key(None)] + ([pages_key(category)] if category is not None else [])
+    return delete_tracked(redis_bytes_client, set_keys)
+
+
+async def get_feed_page(
+    db: AsyncSession, category: Optional[str], cursor: Optional[int], limit: int,
+) -> dict:
+    """
+    Feed page with live view counts.
+
+    Returns:
+        {"items": [...], "next_cursor": id of the last item or None}
+    """
+    key = feed_key(category, cursor, limit)
+    page = await _cached_page(key)
+    if page is None:
+        posts = await post_service.get_posts_page(
+            db=db, category=category, before_id=cursor, limit=limit,
+        )
+        page = {
+            "items": _serialize(posts),
+            # To'liq sahifa - davomi bo'lishi mumkin
+            "next_cursor": posts[-1].id if len(posts) == limit else None,
+        }
+        await _store_page(key, page, category)
+
+    counts = await view_counter.current_views(db, [item["id"] for item in page["items"]])
+    for item in page["items"]:
+        # Sahifa cache da turgan paytda o'chirilgan post - 0
+        item["views"] = counts.get(item["id"], 0)
+    return page
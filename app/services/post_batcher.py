@@ -0,0 +1,195 @@
+"""
+Group commit for post inserts (opt-in: POST_BATCH_ENABLED).
+
+Bir vaqtda kelgan create_post lar navbatga tushadi; fon task ularni
+POST_BATCH_WINDOW_MS ichida (yoki POST_BATCH_MAX_SIZE ta yig'ilganda)
+bitta tranzaksiyada yozadi - MySQL har post uchun emas, har batch uchun
+bir marta fsync qiladi. Har bir chaqiruvchi o'z Post (ID bilan) yoki
+xatosini oladi.
+
+Trade-off: each insert waits up to the window before its commit starts.
+
+If the batch transaction fails (e.g. one row violates a constraint), the
+items are retried one by one in their own transactions, so only the
+offending request gets the error.
+
+Usage:
+    post_batcher = PostInsertBatcher(max_size=50, window=0.005)
+    await post_batcher.start()                 # lifespan
+    post = await post_batcher.submit(post_create)
+    await post_batcher.stop()                  # drains the queue
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.metrics import POST_INSERT_BATCH_DURATION, POST_INSERT_BATCH_FALLBACKS, POST_INSERT_BATCH_SIZE
+from models.post import Post
+from schemas.post import PostCreate
+from services import post_service
+
+logger = logging.getLogger(__name__)
+
+Item = Tuple[PostCreate, asyncio.Future]
+
+
+class PostInsertBatcher:
+    """
+    Collects concurrent inserts and commits them together.
+
+    Args:
+        max_size: Flush as soon as this many inserts are queued
+        window: Seconds to wait for more inserts after the first one
+    """
+
+    def __init__(self, max_size: int = 50, window: float = 0.005):
+        self.max_size = max_size
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="post-insert-batcher")
+
+    async def stop(self) -> None:
+        """Write whatever is queued, then stop the flusher"""
+        if self._task is None:
+            return
+        # Yangi submit lar endi to'g'ridan-to'g'ri yoziladi; navbat oxiriga
+        # sentinel - undan oldingi hamma insert commit bo'ladi (cancel emas:
+        # yozilayotgan batch ning futurelari osilib qolmasin)
+        task, self._task = self._task, None
+        self._queue.put_nowait(None)
+        self._full.set()
+        await task
+
+    async def submit(self, post: PostCreate) -> Post:
+        """
+        Queue one insert and wait for its batch to commit.
+
+        Raises:
+            DatabaseException: If this post could not be inserted
+        """
+        if self._task is None or self._task.done():
+            # start() chaqirilmagan (masalan, skriptlar) yoki flusher to'xtagan - oddiy yo'l
+            async with AsyncSessionLocal() as db:
+                return await post_service.create_post(db=db, post=post)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((post, future))
+        if self._queue.qsize() >= self.max_size:
+            self._full.set()
+        return await future
+
+    # ---------- flusher ----------
+    def _take(self, limit: int) -> Tuple[List[Item], bool]:
+        """Up to `limit` queued items; True if the stop sentinel was reached"""
+        batch = []
+        stopping = False
+        while len(batch) < limit and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        if self._queue.qsize() < self.max_size:
+            self._full.clear()
+        return batch, stopping
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[Item] = []
+            stopping = False
+            try:
+                first = await self._queue.get()
+                if first is None:
+                    return
+                batch.append(first)
+                if self._queue.qsize() + 1 < self.max_size:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), timeout=self.window)
+                    except asyncio.TimeoutError:
+                        pass
+                rest, stopping = self._take(self.max_size - 1)
+                batch += rest
+                await self._write(batch)
+            except asyncio.CancelledError:
+                # Task bekor qilindi - navbatdagilar ham osilib qolmasin
+                self._fail(batch + self._take(self._queue.qsize())[0], None)
+                raise
+            except Exception as e:
+                # Flusher o'lmasin: shu batch xato oladi, keyingilari yoziladi
+                logger.exception(f"Post insert batcher failed on a batch of {len(batch)}")
+                self._fail(batch, e)
+            if stopping:
+                return
+
+    @staticmethod
+    def _fail(batch: List[Item], error: Optional[BaseException]) -> None:
+        """Resolve unanswered futures with `error` (None = cancel them)"""
+        for _, future in batch:
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def _write(self, batch: List[Item]) -> None:
+        POST_INSERT_BATCH_SIZE.observe(len(batch))
+        started = time.perf_counter()
+        try:
+            posts = await self._insert_batch(batch)
+        except SQLAlchemyError as e:
+            POST_INSERT_BATCH_FALLBACKS.inc()
+            logger.warning(f"Batch insert of {len(batch)} posts failed, retrying one by one: {e!r}")
+            await self._insert_each(batch)
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        finally:
+            POST_INSERT_BATCH_DURATION.observe(time.perf_counter() - started)
+
+        for (_, future), post in zip(batch, posts):
+            # Client uzilgan bo'lsa future bekor qilingan - post baribir yozilgan
+            if not future.done():
+                future.set_result(post)
+        logger.info(f"Posts created in one commit: IDs={[post.id for post in posts]}")
+
+    async def _insert_batch(self, batch: List[Item]) -> List[Post]:
+        posts = [Post(**post.model_dump()) for post, _ in batch]
+        async with AsyncSessionLocal() as db:
+            db.add_all(posts)
+            try:
+                # Bitta tranzaksiya, bitta commit (fsync); ID lar flush da to'ladi
+                await db.commit()
+            except SQLAlchemyError:
+                await db.rollback()
+                raise
+        return posts
+
+    async def _insert_each(self, batch: List[Item]) -> None:
+        for post, future in batch:
+            try:
+                async with AsyncSessionLocal() as db:
+                    created = await post_service.create_post(db=db, post=post)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(created)
+
+
+post_batcher = PostInsertBatcher(
+    max_size=settings.POST_BATCH_MAX_SIZE,
+    window=settings.POST_BATCH_WINDOW_MS / 1000,
+)
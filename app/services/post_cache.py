@@ -0,0 +1,144 @@
+"""
+Post list cache - pre-compressed JSON pages in Redis.
+
+Har bir sahifa bitta Redis hash:
+    posts:{skip}:{limit} -> {"identity": json, "gzip": ..., "br": ..., "zstd": ...}
+
+Sahifa har bir encoding uchun bir marta siqiladi; keyingi hitlarda tayyor
+bytes Content-Encoding bilan yuboriladi (CompressionMiddleware ularni
+qayta siqmaydi). Hash ning bitta TTL i bor - yangi variant qo'shish uni
+uzaytirmaydi, o'chirish esa barcha variantlarni birga o'chiradi.
+"""
+import logging
+from typing import Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.redis_client import delete_tracked, redis_bytes_client, track_key
+from core.responses import dumps
+from middleware.compression import available_encodings, compress, negotiate_encoding
+from middleware.timing import timed
+from services import post_service
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+PAGE_TTL = 60  # seconds
+PAGES_KEY = "posts:pages"   # cache dagi sahifa kalitlari (invalidate_pages uchun)
+
+# Cache uchun ham middleware bilan bir xil encodinglar
+ENCODINGS = available_encodings(settings.COMPRESSION_ENCODINGS) if settings.COMPRESSION_ENABLED else ()
+
+# (body, content-encoding yoki None)
+Page = Tuple[bytes, Optional[str]]
+
+
+def page_key(skip: int, limit: int) -> str:
+    return f"posts:{skip}:{limit}"
+
+
+def accepted_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Encoding to serve for this request's Accept-Encoding (None = identity)"""
+    return negotiate_encoding(accept_encoding, ENCODINGS)
+
+
+def _compress_for(body: bytes, encoding: Optional[str]) -> Optional[bytes]:
+    if encoding is None or len(body) < settings.COMPRESSION_MIN_SIZE:
+        return None
+    with timed("compress"):
+        return compress(body, encoding, settings.compression_levels[encoding])
+
+
+async def build_page(db: AsyncSession, skip: int, limit: int) -> bytes:
+    """Load a page of posts from the DB and encode it once (cache + response)"""
+    posts = await post_service.get_posts(db=db, skip=skip, limit=limit)
+    posts_data = [
+        {"id": p.id, "title": p.title, "content": p.content}
+        for p in posts
+    ]
+    with timed("render"):
+        return dumps(posts_data)
+
+
+def get_page(key: str, encoding: Optional[str]) -> Optional[Page]:
+    """
+    Cached page in the requested encoding, or None on a cache miss.
+
+    If only the identity JSON is cached, the variant is compressed now and
+    stored, so every later hit is served ready-made.
+    """
+    fields = [IDENTITY] if encoding is None else [encoding, IDENTITY]
+    values = redis_bytes_client.hmget(key, fields)
+
+    if encoding is not None and values[0] is not None:
+        return values[0], encoding
+
+    identity = values[-1]
+    if identity is None:
+        return None
+
+    compressed = _compress_for(identity, encoding)
+    if compressed is None:
+        return identity, None
+
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    pipe.hset(key, encoding, compressed)
+    # Kalit shu orada eskirgan bo'lsa ham TTL siz qolmasin (mavjud TTL o'zgarmaydi)
+    pipe.expire(key, PAGE_TTL, nx=True)
+    with timed("cache"):
+        pipe.execute()
+    return compressed, encoding
+
+
+def _replace_page(key: str, mapping: dict) -> None:
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    pipe.delete(key)
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, PAGE_TTL)
+    track_key(pipe, PAGES_KEY, key, PAGE_TTL)
+    with timed("cache"):
+        pipe.execute()
+
+
+def store_page(key: str, body: bytes, encoding: Optional[str]) -> Page:
+    """
+    Cache a freshly rendered page (identity + the requested encoding).
+
+    Returns:
+        The page to send for this request
+    """
+    mapping = {IDENTITY: body}
+    compressed = _compress_for(body, encoding)
+    if compressed is not None:
+        mapping[encoding] = compressed
+    _replace_page(key, mapping)
+
+    if compressed is not None:
+        return compressed, encoding
+    return body, None
+
+
+def preload_page(key: str, body: bytes) -> None:
+    """Cache a page with every available encoding (startup warmup)"""
+    mapping = {IDENTITY: body}
+    for encoding in ENCODINGS:
+        compressed = _compress_for(body, encoding)
+        if compressed is not None:
+            mapping[encoding] = compressed
+    _replace_page(key, mapping)
+
+
+def invalidate_pages() -> int:
+    """Drop every cached page (any post write shifts skip/limit pages)"""
+    return delete_tracked(redis_bytes_client, [PAGES_KEY])
+
+
+def page_response(page: Page) -> Response:
+    """JSON response for a cached page (Content-Encoding set when compressed)"""
+    body, encoding = page
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,45 @@
+"""
+Post write side effects - background jobs (core.jobs).
+
+create_post / delete_post row commit bo'lgach faqat job qo'yadi; cache
+tozalash request yo'lida emas, job queue workerlarida bajariladi.
+
+Sahifa kalitlari yozilganda to'plamlarda saqlanadi (post_cache /
+feed_cache.invalidate_pages) - tozalash faqat ta'sirlangan kalitlarni
+o'chiradi, butun keyspace SCAN qilinmaydi.
+
+Jobs are idempotent (deleting keys / counters twice is harmless), so the
+at-least-once Redis backend may safely run one twice.
+
+Usage:
+    job_queue.enqueue(POST_CREATED, post_id=post.id, category=post.category)
+    job_queue.enqueue(POST_DELETED, post_id=post_id)
+"""
+import logging
+from typing import Optional
+
+from core.jobs import job_queue
+from core.redis_client import redis_client
+from services import feed_cache, post_cache
+from services.view_counter import PENDING_KEY
+
+logger = logging.getLogger(__name__)
+
+POST_CREATED = "post_created"
+POST_DELETED = "post_deleted"
+
+
+@job_queue.job(POST_CREATED)
+def post_created(post_id: int, category: Optional[str] = None) -> None:
+    """New post: v1 list pages, and v2 feed pages that can contain it"""
+    deleted = post_cache.invalidate_pages() + feed_cache.invalidate_pages(category)
+    logger.debug(f"Post {post_id} created, {deleted} cached pages invalidated")
+
+
+@job_queue.job(POST_DELETED)
+def post_deleted(post_id: int) -> None:
+    """Deleted post: every cached page, and its unflushed view count"""
+    # Kategoriya endi noma'lum - barcha feed sahifalari
+    deleted = post_cache.invalidate_pages() + feed_cache.invalidate_pages(everything=True)
+    redis_client.hdel(PENDING_KEY, post_id)
+    logger.debug(f"Post {post_id} deleted, {deleted} cached pages invalidated")
@@ -1,6 +1,8 @@
 """
 Post Service - ASYNC version
 """
+from typing import Dict, List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
@@ -124,6 +126,59 @@ async def get_posts(db: AsyncSession, skip: int = 0, limit: int = 100):
         raise DatabaseException("Could not fetch posts")
 
 
+# ========================================
+# KEYSET FEED (v2)
+# ========================================
+async def get_posts_page(
+    db: AsyncSession,
+    category: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = 20,
+):
+    """
+    Newest-first page of posts after a cursor (ASYNC).
+
+    Keyset pagination: WHERE category = ? AND id < ? ORDER BY id DESC LIMIT ?
+    reads only `limit` rows from the (category, id) index, however deep the
+    page - OFFSET would scan and discard every skipped row.
+
+    Args:
+        db: Async database session
+        category: Only posts of this category (None = all)
+        before_id: Cursor - id of the last post of the previous page
+        limit: Page size
+
+    Returns:
+        List of posts
+    """
+    query = select(Post)
+    if category is not None:
+        query = query.where(Post.category == category)
+    if before_id is not None:
+        query = query.where(Post.id < before_id)
+    try:
+        result = await db.execute(query.order_by(Post.id.desc()).limit(limit))
+        return result.scalars().all()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching post feed: {str(e)}")
+        raise DatabaseException("Could not fetch posts")
+
+
+async def get_post_views(db: AsyncSession, post_ids: List[int]) -> Dict[int, int]:
+    """
+    Flushed view counts by post id (ASYNC); deleted posts are left out.
+
+    Raises:
+        DatabaseException: If database error occurs
+    """
+    try:
+        result = await db.execute(select(Post.id, Post.views).where(Post.id.in_(post_ids)))
+        return {post_id: views for post_id, views in result.all()}
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching post views: {str(e)}")
+        raise DatabaseException("Could not fetch post views")
+
+
 # ========================================
 # DELETE POST
 # ========================================
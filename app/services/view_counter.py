@@ -0,0 +1,238 @@
+"""
+Write-behind post view counters.
+
+Har bir o'qish faqat cache da atomik HINCRBY qiladi; fon task har
+VIEW_FLUSH_INTERVAL soniyada yig'ilgan deltalarni DB ga batch UPDATE
+bilan yozadi. O'qish trafigi hech qachon per-request UPDATE bo'lmaydi.
+
+Flow:
+    record_view(post_id)           HINCRBY post_views:pending {id} 1 -> yangi delta
+    ViewCounterFlusher (har N s)   MULTI HGETALL + DEL -> UPDATE ... CASE
+                                   -> HDEL post_views:db {yozilgan id lar}
+    current_views(db, ids)         DB views (post_views:db cache) + delta
+
+Listing cache lari (v2 feed) views ni saqlamaydi - son har o'qishda shu
+yerdan olinadi, flush sahifalarni eskirtirmaydi. post_views:db da DB dagi
+qiymatlar turadi (TTL bilan); flush faqat o'zi yozgan postlarnikini o'chiradi.
+
+Pending deltas live in Redis (or the in-process backend), so with several
+workers each flusher drains whatever is pending - HGETALL + DEL runs as one
+transaction, a delta is never written twice. If the UPDATE fails the deltas
+are added back and retried on the next tick.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import AsyncSessionLocal
+from core.metrics import POST_VIEW_FLUSH_DURATION, POST_VIEW_FLUSH_FAILURES, POST_VIEWS_FLUSHED
+from core.redis_client import redis_client
+from models.post import Post
+from services import post_service
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "post_views:pending"
+# DB dagi (flush qilingan) views cache i - listinglar har so'rovda DB ga bormasin
+DB_VIEWS_KEY = "post_views:db"
+# Butun hash ning TTL i (NX - yangilanishda uzaymaydi): flush bilan poyga
+# bo'lib eski qiymat qolsa ham shu vaqtdan oshmaydi
+DB_VIEWS_TTL = 60  # seconds
+
+
+# ========================================
+# READ PATH (sync client - thread da, event loop bloklanmasin)
+# ========================================
+async def record_view(post_id: int) -> int:
+    """
+    Count one read (single atomic HINCRBY, no DB write).
+
+    Returns:
+        The post's pending (unflushed) delta including this view, 0 if the
+        counter is unavailable
+    """
+    try:
+        return await asyncio.to_thread(redis_client.hincrby, PENDING_KEY, post_id, 1)
+    except Exception as e:
+        # Hisoblagich ishlamasa ham post o'qilishi kerak
+        logger.warning(f"View count for post {post_id} lost: {e!r}")
+        return 0
+
+
+def _cached_counts(post_ids: List[int]) -> List[List]:
+    """[cached DB views, pending deltas] - one round trip"""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hmget(DB_VIEWS_KEY, post_ids)
+    pipe.hmget(PENDING_KEY, post_ids)
+    return pipe.execute()
+
+
+def _store_db_views(db_views: Dict[int, int]) -> None:
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(DB_VIEWS_KEY, mapping=db_views)
+    pipe.expire(DB_VIEWS_KEY, DB_VIEWS_TTL, nx=True)
+    pipe.execute()
+
+
+async def current_views(db: AsyncSession, post_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Current view count per post id: flushed DB value + pending delta.
+
+    DB values come from the post_views:db cache; misses (and everything, if
+    Redis is down) are read from the database. Deleted posts are left out.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    try:
+        cached, pending = await asyncio.to_thread(_cached_counts, post_ids)
+    except Exception as e:
+        logger.warning(f"Cached view counts unavailable: {e!r}")
+        cached = pending = [None] * len(post_ids)
+
+    db_views = {post_id: int(value) for post_id, value in zip(post_ids, cached) if value is not None}
+    missing = [post_id for post_id in post_ids if post_id not in db_views]
+    if missing:
+        loaded = await post_service.get_post_views(db, missing)
+        db_views.update(loaded)
+        if loaded:
+            try:
+                await asyncio.to_thread(_store_db_views, loaded)
+            except Exception as e:
+                logger.warning(f"Could not cache post views: {e!r}")
+
+    return {
+        post_id: db_views[post_id] + int(delta or 0)
+        for post_id, delta in zip(post_ids, pending)
+        if post_id in db_views
+    }
+
+
+# ========================================
+# FLUSH
+# ========================================
+def take_pending() -> Dict[int, int]:
+    """Atomically read and clear the pending deltas"""
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.hgetall(PENDING_KEY)
+    pipe.delete(PENDING_KEY)
+    deltas, _ = pipe.execute()
+    return {int(post_id): int(delta) for post_id, delta in deltas.items() if int(delta)}
+
+
+def restore_pending(deltas: Dict[int, int]) -> None:
+    """Put deltas back after a failed flush (added to anything counted since)"""
+    pipe = redis_client.pipeline(transaction=True)
+    for post_id, delta in deltas.items():
+        pipe.hincrby(PENDING_KEY, post_id, delta)
+    pipe.execute()
+
+
+async def write_deltas(deltas: Dict[int, int]) -> None:
+    """
+    One UPDATE per batch:
+        UPDATE posts SET views = views + CASE id WHEN 1 THEN 5 WHEN 7 THEN 2 END
+        WHERE id IN (1, 7)
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Post)
+            .where(Post.id.in_(deltas))
+            .values(views=Post.views + case(deltas, value=Post.id, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def flush_views(batch_size: int = 500) -> int:
+    """Drain pending deltas into the database; returns the number of views written"""
+    deltas = await asyncio.to_thread(take_pending)
+    if not deltas:
+        return 0
+
+    items = sorted(deltas.items())   # id tartibida - row lock lar bir xil tartibda
+    written = 0
+    for start in range(0, len(items), batch_size):
+        batch = dict(items[start:start + batch_size])
+        started = time.perf_counter()
+        try:
+            await write_deltas(batch)
+        except (Exception, asyncio.CancelledError):
+            # Cancel (stop timeout) da ham - olingan deltalar yo'qolmasin
+            POST_VIEW_FLUSH_FAILURES.inc()
+            unwritten = dict(items[start:])
+            await asyncio.to_thread(restore_pending, unwritten)
+            raise
+        finally:
+            POST_VIEW_FLUSH_DURATION.observe(time.perf_counter() - started)
+        views = sum(batch.values())
+        POST_VIEWS_FLUSHED.inc(views)
+        written += views
+        try:
+            # Commit dan keyin: shu postlarning eski DB views i o'qilmasin
+            await asyncio.to_thread(redis_client.hdel, DB_VIEWS_KEY, *batch)
+        except Exception as e:
+            logger.warning(f"Cached post views not invalidated (stale for up to {DB_VIEWS_TTL}s): {e!r}")
+    return written
+
+
+class ViewCounterFlusher:
+    """
+    Background task that calls flush_views every `interval` seconds and
+    once more on stop, so counts are not lost on a graceful shutdown.
+
+    The final flush is bounded by `stop_timeout` and skipped if the last
+    flush failed (Redis / DB down) - shutdown should not hang on it; the
+    deltas stay pending in Redis for the next process.
+
+    Args:
+        interval: Seconds between flushes
+        batch_size: Posts per UPDATE statement
+        stop_timeout: Seconds the final flush on stop may take
+    """
+
+    def __init__(self, interval: float = 5.0, batch_size: int = 500, stop_timeout: float = 2.0):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stop_timeout = stop_timeout
+        self._task: Optional[asyncio.Task] = None
+        self._healthy = True   # oxirgi flush muvaffaqiyatlimi
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="view-counter-flusher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not self._healthy:
+            logger.warning("Last view flush failed, skipping the final flush")
+            return
+        try:
+            await asyncio.wait_for(self._flush(), timeout=self.stop_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Final view flush did not finish in {self.stop_timeout}s")
+
+    async def _flush(self) -> None:
+        try:
+            written = await flush_views(self.batch_size)
+        except Exception as e:
+            self._healthy = False
+            logger.error(f"View counter flush failed (retrying next tick): {e!r}")
+            return
+        self._healthy = True
+        if written:
+            logger.debug(f"Flushed {written} post views")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._flush()
@@ -0,0 +1,68 @@
+"""
+Access-log cost per request under different sampling/level settings.
+
+Records go through a real Formatter into an in-memory stream, so the
+numbers include message formatting, the part sampling and level checks
+skip.
+
+Usage:
+    python benchmarks/bench_access_log.py [--iterations 5000]
+"""
+import argparse
+import asyncio
+import io
+import logging
+
+from common import asgi_request, time_per_call
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from core.logging_config import LOG_FORMAT
+from middleware import ObservabilityMiddleware
+
+# (label, logger level, access_log_sample_rate)
+SCENARIOS = [
+    ("DEBUG, sample=1.0 (Started + done)", logging.DEBUG, 1.0),
+    ("INFO, sample=1.0", logging.INFO, 1.0),
+    ("INFO, sample=0.1", logging.INFO, 0.1),
+    ("INFO, sample=0.0", logging.INFO, 0.0),
+    ("WARNING (access log disabled)", logging.WARNING, 1.0),
+]
+
+
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+async def main(iterations):
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    access_logger = logging.getLogger("middleware.access")
+    access_logger.handlers = [handler]
+    access_logger.propagate = False
+
+    results = {}
+    for label, level, rate in SCENARIOS:
+        access_logger.setLevel(level)
+        app = Starlette(routes=[Route("/ping", ping)])
+        app.add_middleware(ObservabilityMiddleware, access_log_sample_rate=rate)
+        results[label] = await time_per_call(
+            lambda: asgi_request(app, "GET", "/ping"), iterations
+        )
+        stream.seek(0)
+        stream.truncate()
+
+    baseline = results[SCENARIOS[1][0]]
+    print(f"{'scenario':<36} {'us/req':>9} {'saved':>9}")
+    for label, us in results.items():
+        print(f"{label:<36} {us:>9.1f} {baseline - us:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
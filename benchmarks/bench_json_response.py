@@ -0,0 +1,103 @@
+"""
+JSON response throughput for the 100-post list payload.
+
+Compares FastAPI's stdlib JSONResponse with FastJSONResponse (orjson): as
+default_response_class (FastAPI still runs jsonable_encoder on the returned
+list), returned directly by the route (no encoder pass) and when the route
+encodes the body itself, plus the cache-hit path that sends stored bytes
+without re-encoding.
+
+Usage:
+    python benchmarks/bench_json_response.py [--iterations 2000] [--posts 100]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from common import asgi_request, time_per_call
+
+from fastapi import FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.responses import FastJSONResponse, dumps
+
+
+def make_posts(count):
+    created = datetime(2024, 2, 1, 10, 30, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Post {i}",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "created_at": created,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def build_app(response_class, posts, cached):
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/dicts")
+    async def dicts():
+        return posts
+
+    @app.get("/direct")
+    async def direct():
+        return FastJSONResponse(posts)
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(dumps(posts), media_type="application/json")
+
+    @app.get("/cached")
+    async def cached_hit():
+        return Response(cached, media_type="application/json")
+
+    return app
+
+
+async def main(iterations, count):
+    posts = make_posts(count)
+    cached = dumps(posts)
+    stdlib_app = build_app(JSONResponse, posts, cached)
+    fast_app = build_app(FastJSONResponse, posts, cached)
+
+    scenarios = [
+        ("JSONResponse, return list", stdlib_app, "/dicts"),
+        ("FastJSONResponse, return list", fast_app, "/dicts"),
+        ("FastJSONResponse, returned directly", fast_app, "/direct"),
+        ("FastJSONResponse, route encodes", fast_app, "/encoded"),
+        ("cache hit, raw bytes", fast_app, "/cached"),
+    ]
+
+    results = {}
+    for label, app, path in scenarios:
+        results[label] = await time_per_call(lambda: asgi_request(app, "GET", path), iterations)
+
+    # Faqat encoding (ASGI va routing siz)
+    render = {
+        "jsonable_encoder + json.dumps": lambda: JSONResponse(jsonable_encoder(posts)).body,
+        "orjson dumps": lambda: dumps(posts),
+    }
+
+    async def call(fn):
+        fn()
+
+    for label, fn in render.items():
+        results[f"render only: {label}"] = await time_per_call(lambda: call(fn), iterations)
+
+    print(f"payload: {count} posts, {len(cached)} bytes")
+    baseline = results[scenarios[0][0]]
+    print(f"{'scenario':<42} {'us/req':>9} {'req/s':>9} {'speedup':>8}")
+    for label, us in results.items():
+        print(f"{label:<42} {us:>9.1f} {1e6 / us:>9.0f} {baseline / us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.posts))
@@ -0,0 +1,112 @@
+"""
+Middleware stack overhead per request.
+
+Compares a bare Starlette app, the old three-layer BaseHTTPMiddleware stack
+(RequestID + Timing + Logging) and the single pure-ASGI
+ObservabilityMiddleware. Log output is discarded so the numbers show the
+stack itself, not handler I/O.
+
+Usage:
+    python benchmarks/bench_middleware.py [--iterations 5000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from common import asgi_request, time_per_call
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from middleware import ObservabilityMiddleware
+
+legacy_logger = logging.getLogger("bench.legacy")
+
+
+# ========================================
+# OLD STACK (reference copy)
+# ========================================
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{time.time() - start_time:.3f}"
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = getattr(request.state, "request_id", "no-id")
+        client_ip = request.client.host if request.client else "unknown"
+        legacy_logger.info(
+            f"[{request_id}] {client_ip} - {request.method} {request.url.path} - Started"
+        )
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        legacy_logger.info(
+            f"[{request_id}] {client_ip} - {request.method} {request.url.path} - "
+            f"{response.status_code} - {time.perf_counter() - start_time:.3f}s"
+        )
+        return response
+
+
+# ========================================
+# APPS
+# ========================================
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(stack):
+    app = Starlette(routes=[Route("/ping", ping)])
+    for middleware in stack:
+        app.add_middleware(middleware)
+    return app
+
+
+STACKS = {
+    "bare": [],
+    "legacy (3x BaseHTTPMiddleware)": [
+        LegacyRequestIDMiddleware,
+        LegacyTimingMiddleware,
+        LegacyLoggingMiddleware,
+    ],
+    "ObservabilityMiddleware": [ObservabilityMiddleware],
+}
+
+
+async def main(iterations):
+    # Log records are created (level INFO) but written nowhere
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+
+    results = {}
+    for name, stack in STACKS.items():
+        app = build_app(stack)
+        results[name] = await time_per_call(
+            lambda: asgi_request(app, "GET", "/ping"), iterations
+        )
+
+    bare = results["bare"]
+    print(f"{'stack':<34} {'us/req':>9} {'overhead':>9}")
+    for name, us in results.items():
+        print(f"{name:<34} {us:>9.1f} {us - bare:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
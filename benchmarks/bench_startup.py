@@ -0,0 +1,175 @@
+"""
+Cold-start budget: import cost of `main` and time to first response.
+
+Every run is a fresh interpreter (same as a new worker / autoscaled pod):
+- python -X importtime -c "import main"  -> per-package self time
+- import main + lifespan startup (warmup off) + GET /health/live, timed
+  from spawn until the response arrives (shutdown / teardown excluded)
+
+Children run on the service-free backends like benchmarks/loadtest.py
+(temporary SQLite DATABASE_URL, CACHE_BACKEND=memory), so the numbers do
+not depend on MySQL / Redis being reachable.
+
+Modules in DEFERRED must not be imported by `import main` at all; they are
+loaded on first use (auth, Redis, DB drivers).
+
+With --check the script exits 1 when a budget is exceeded or a deferred
+module is imported eagerly, so it can run as a CI gate.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--check]
+        [--import-budget-ms 1500] [--ttfr-budget-ms 2500]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from common import APP_DIR
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Birinchi ishlatilganda import qilinadi (services.auth_service, core.redis_client,
+# core.database get_engine / get_async_engine)
+DEFERRED = ("jose", "bcrypt", "redis", "pymysql", "aiomysql")
+
+FIRST_RESPONSE_SCRIPT = """
+import asyncio, json, sys, time
+spawned = time.time()
+start = time.perf_counter()
+sys.path.insert(0, {bench_dir!r})
+from common import asgi_request
+import main
+imported = time.perf_counter()
+
+async def first_response():
+    async with main.lifespan(main.app):
+        started = time.perf_counter()
+        status, _, _ = await asgi_request(main.app, "GET", "/health/live")
+        # Javob shu yerda - shutdown va teardown TTFR ga kirmaydi
+        return status, started, time.perf_counter(), time.time()
+
+status, started, responded, responded_at = asyncio.run(first_response())
+print(json.dumps({{
+    "status": status,
+    "responded_at": responded_at,
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "in_process_ms": (responded - start) * 1000,
+    "shutdown_ms": (time.perf_counter() - responded) * 1000,
+}}), flush=True)
+"""
+
+# Servissiz backendlar (benchmarks/loadtest.py kabi) - MySQL / Redis kerak emas
+DB_DIR = tempfile.mkdtemp(prefix="bench-startup-")
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("LOG_FILE_PATH", os.path.join(DB_DIR, "app.log"))
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'startup.db')}"
+    env["CACHE_BACKEND"] = "memory"
+    env["WARMUP_ENABLED"] = "False"
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return env
+
+
+def measure_imports():
+    """(total ms, {package: self ms}, set of imported modules)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    packages = Counter()
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        modules.add(name)
+        packages[name.split(".")[0]] += int(self_us)
+        if name == "main":
+            total_us = int(cumulative_us)
+    return total_us / 1000, {k: v / 1000 for k, v in packages.items()}, modules
+
+
+def measure_first_response():
+    """Time from process spawn to the first response, plus in-process phases"""
+    script = FIRST_RESPONSE_SCRIPT.format(bench_dir=BENCH_DIR)
+    # Wall clock: child javob kelgan paytni time.time() bilan yozadi
+    spawned_at = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=APP_DIR, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    if phases["status"] != 200:
+        raise RuntimeError(f"first response status {phases['status']}")
+    phases["ttfr_ms"] = (phases.pop("responded_at") - spawned_at) * 1000
+    return phases
+
+
+def main(runs, import_budget_ms, ttfr_budget_ms, check, top):
+    # Birinchi run .pyc yozadi - hisobga olinmaydi
+    measure_imports()
+
+    totals, package_runs, eager = [], [], set()
+    for _ in range(runs):
+        total, packages, modules = measure_imports()
+        totals.append(total)
+        package_runs.append(packages)
+        eager |= {m.split(".")[0] for m in modules} & set(DEFERRED)
+
+    responses = [measure_first_response() for _ in range(runs)]
+
+    import_ms = statistics.median(totals)
+    ttfr_ms = statistics.median(r["ttfr_ms"] for r in responses)
+
+    print(f"import main: {import_ms:.1f}ms (median of {runs})")
+    print(f"\n{'package':<36} {'self ms':>9}")
+    names = set().union(*package_runs)
+    medians = {n: statistics.median(p.get(n, 0.0) for p in package_runs) for n in names}
+    for name, ms in sorted(medians.items(), key=lambda item: -item[1])[:top]:
+        print(f"{name:<36} {ms:>9.1f}")
+
+    print(f"\n{'first response phase':<36} {'ms':>9}")
+    for key in ("import_ms", "lifespan_ms", "in_process_ms", "ttfr_ms", "shutdown_ms"):
+        print(f"{key:<36} {statistics.median(r[key] for r in responses):>9.1f}")
+
+    failures = []
+    if eager:
+        failures.append(f"deferred modules imported eagerly: {', '.join(sorted(eager))}")
+    if import_ms > import_budget_ms:
+        failures.append(f"import main {import_ms:.1f}ms > budget {import_budget_ms}ms")
+    if ttfr_ms > ttfr_budget_ms:
+        failures.append(f"time to first response {ttfr_ms:.1f}ms > budget {ttfr_budget_ms}ms")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"OK: within budget (import {import_budget_ms}ms, first response {ttfr_budget_ms}ms)")
+    return 1 if check and failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("--import-budget-ms", type=float,
+                        default=float(os.environ.get("IMPORT_BUDGET_MS", 1500)))
+    parser.add_argument("--ttfr-budget-ms", type=float,
+                        default=float(os.environ.get("TTFR_BUDGET_MS", 2500)))
+    parser.add_argument("--check", action="store_true", help="exit 1 on budget regression")
+    args = parser.parse_args()
+    try:
+        sys.exit(main(args.runs, args.import_budget_ms, args.ttfr_budget_ms, args.check, args.top))
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,272 @@
+"""
+Offline load test: the real app in-process against local stand-ins.
+
+Runs on the service-free backends: DATABASE_URL points at a temporary
+SQLite file (pysqlite + aiosqlite) and CACHE_BACKEND=memory replaces Redis.
+Everything else - routes, services, middleware, metrics, cache - is the
+production code.
+Rate limits are disabled so the numbers show the request path itself.
+
+Each scenario is warmed up with a few unmeasured requests, then sends
+--requests requests from --concurrency concurrent clients and reports throughput and p50/p95/p99 latency. Results are JSON;
+--baseline compares against an earlier result file and --check exits 1
+when throughput drops or p95 grows by more than --tolerance.
+
+Usage:
+    python benchmarks/loadtest.py [--requests 1000] [--concurrency 32]
+        [--scenarios posts_list,post_detail] [--output result.json]
+        [--baseline baseline.json] [--tolerance 0.15] [--check]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Settings app modullari import qilinishidan oldin: servissiz backendlar
+DB_DIR = tempfile.mkdtemp(prefix="loadtest-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'loadtest.db')}"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_FILE_PATH", os.path.join(DB_DIR, "app.log"))
+
+from common import APP_DIR, asgi_request, percentiles  # noqa: E402
+
+SEED_POSTS = 1000
+CATEGORIES = ("tech", "science", "sport", "culture")
+BENCH_EMAIL = "loadtest@example.com"
+BENCH_PASSWORD = "loadtest-password"
+
+
+# ========================================
+# SETUP
+# ========================================
+def seed():
+    from core.database import SessionLocal, create_tables
+    from models.post import Post
+    from models.user import User
+    from services.auth_service import hash_password
+
+    create_tables()
+    with SessionLocal() as db:
+        db.add_all(
+            Post(
+                title=f"Post {i}",
+                content=f"Post {i} content. " + "Lorem ipsum dolor sit amet. " * 20,
+                category=CATEGORIES[i % len(CATEGORIES)],
+            )
+            for i in range(SEED_POSTS)
+        )
+        db.add(User(email=BENCH_EMAIL, hashed_password=hash_password(BENCH_PASSWORD), full_name="Load Test"))
+        db.commit()
+
+
+def cleanup():
+    shutil.rmtree(DB_DIR, ignore_errors=True)
+
+
+def disable_rate_limits(main_module):
+    from api.v1.routes import auth, post
+
+    for limiter in (main_module.limiter, auth.limiter, post.limiter):
+        limiter.enabled = False
+
+
+# ========================================
+# SCENARIOS
+# ========================================
+# name -> (default request count factor, request builder(i, ctx) -> (method, path, headers, body))
+def _json(payload):
+    return json.dumps(payload).encode()
+
+
+def _auth(ctx, extra=None):
+    headers = {"authorization": f"Bearer {ctx['token']}", "accept-encoding": "gzip"}
+    headers.update(extra or {})
+    return headers
+
+
+SCENARIOS = {
+    # Cache hit (sahifa birinchi requestda to'ladi)
+    "posts_list": (1.0, lambda i, ctx: ("GET", "/api/v1/posts/", {"accept-encoding": "gzip"}, b"")),
+    # Har safar boshqa sahifa - DB + render + cache yozish
+    "posts_list_miss": (0.5, lambda i, ctx: (
+        "GET", f"/api/v1/posts/?skip={i % SEED_POSTS}&limit=20", {"accept-encoding": "gzip"}, b"",
+    )),
+    # v2 keyset feed: kategoriya bo'yicha, cache + live views
+    "feed_category": (1.0, lambda i, ctx: (
+        "GET", f"/api/v2/posts/?category={CATEGORIES[i % len(CATEGORIES)]}&limit=20",
+        {"accept-encoding": "gzip"}, b"",
+    )),
+    "post_detail": (1.0, lambda i, ctx: (
+        "GET", f"/api/v1/posts/{ctx['rng'].randint(1, SEED_POSTS)}", {}, b"",
+    )),
+    "post_create": (0.5, lambda i, ctx: (
+        "POST", "/api/v1/posts/", _auth(ctx, {"content-type": "application/json"}),
+        _json({"title": f"Load {i}", "content": "Created by the load test. " * 10}),
+    )),
+    "auth_me": (1.0, lambda i, ctx: ("GET", "/api/v1/auth/me", _auth(ctx), b"")),
+    # bcrypt verify - ataylab sekin, kam request
+    "auth_login": (0.05, lambda i, ctx: (
+        "POST", "/api/v1/auth/login", {"content-type": "application/json"},
+        _json({"email": BENCH_EMAIL, "password": BENCH_PASSWORD}),
+    )),
+}
+
+
+async def run_scenario(app, build, requests, concurrency, ctx):
+    # Isitish: cache, pool va lazy importlar o'lchovga tushmasin
+    for i in range(min(concurrency, requests)):
+        method, path, headers, body = build(i, ctx)
+        await asgi_request(app, method, path, headers, body)
+
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for i in counter:
+            method, path, headers, body = build(i, ctx)
+            start = time.perf_counter()
+            status, _, _ = await asgi_request(app, method, path, headers, body)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        **percentiles(latencies),
+    }
+
+
+async def login_token(app):
+    status, _, body = await asgi_request(
+        app, "POST", "/api/v1/auth/login", {"content-type": "application/json"},
+        _json({"email": BENCH_EMAIL, "password": BENCH_PASSWORD}),
+    )
+    if status != 200:
+        raise RuntimeError(f"login failed: {status} {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+
+# ========================================
+# REPORT
+# ========================================
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True, text=True,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(result, baseline, tolerance):
+    """Print deltas vs baseline; return list of regressions"""
+    regressions = []
+    print(f"\n{'scenario':<18} {'rps':>9} {'base':>9} {'Δ%':>7} {'p95':>8} {'base':>8} {'Δ%':>7}")
+    for name, current in result["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            print(f"{name:<18} {current['rps']:>9.1f} {'-':>9}")
+            continue
+        rps_delta = (current["rps"] - base["rps"]) / base["rps"] if base["rps"] else 0.0
+        p95_delta = (current["p95"] - base["p95"]) / base["p95"] if base["p95"] else 0.0
+        print(
+            f"{name:<18} {current['rps']:>9.1f} {base['rps']:>9.1f} {rps_delta * 100:>6.1f}% "
+            f"{current['p95']:>8.2f} {base['p95']:>8.2f} {p95_delta * 100:>6.1f}%"
+        )
+        if rps_delta < -tolerance:
+            regressions.append(f"{name}: throughput {rps_delta * 100:.1f}%")
+        if p95_delta > tolerance:
+            regressions.append(f"{name}: p95 +{p95_delta * 100:.1f}%")
+    return regressions
+
+
+async def main(args):
+    random.seed(args.seed)
+    try:
+        seed()
+
+        import main as main_module
+
+        app = main_module.app
+        disable_rate_limits(main_module)
+
+        ctx = {"rng": random.Random(args.seed)}
+        results = {}
+        async with main_module.lifespan(app):
+            ctx["token"] = await login_token(app)
+            for name in args.scenarios:
+                factor, build = SCENARIOS[name]
+                requests = max(args.concurrency, int(args.requests * factor))
+                results[name] = await run_scenario(app, build, requests, args.concurrency, ctx)
+                print(
+                    f"{name:<18} {results[name]['rps']:>9.1f} req/s  "
+                    f"p50 {results[name]['p50']:>7.2f}ms  p95 {results[name]['p95']:>7.2f}ms  "
+                    f"p99 {results[name]['p99']:>7.2f}ms  errors {results[name]['errors']}",
+                    flush=True,
+                )
+    finally:
+        cleanup()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000, help="base requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write result JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regression vs baseline")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    result = asyncio.run(main(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\nResult written to {args.output}")
+    else:
+        print(json.dumps(result, indent=2))
+
+    if args.baseline:
+        regressions = compare(result, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if args.check and regressions:
+            sys.exit(1)
@@ -0,0 +1,202 @@
+"""
+Replay captured production traffic against the app in-process.
+
+Input is the JSONL written by core.traffic_capture (TRAFFIC_CAPTURE_ENABLED);
+several files (one per worker) are merged by timestamp. The app runs on the
+same service-free backends and seed data as benchmarks/loadtest.py.
+
+Requests are sent open-loop at their original inter-arrival times divided
+by --speed (2 = twice the captured rate); --speed 0 ignores timing and
+replays as fast as --concurrency clients allow. Redacted fields are
+replaced with the load-test user's credentials, and requests that carried
+a token get a valid one.
+
+Report per method + route template: count, errors (5xx), status changes vs the
+capture, p50/p95/p99 latency and the captured p50; plus scheduling lag,
+which shows when the replayer itself could not keep up with the rate.
+
+Usage:
+    python benchmarks/replay.py logs/traffic-*.jsonl [--speed 1.0]
+        [--concurrency 64] [--limit 10000] [--output replay.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+# loadtest import: servissiz backend env + seed data
+import loadtest
+from common import asgi_request, percentiles
+from loadtest import BENCH_EMAIL, BENCH_PASSWORD
+
+REDACTED = "<redacted>"
+SUBSTITUTES = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+
+
+def route_key(record):
+    return f"{record['method']} {record['route']}"
+
+
+def load_capture(paths, limit=None):
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+
+def unredact(value, field=""):
+    if isinstance(value, dict):
+        return {key: unredact(item, key) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unredact(item, field) for item in value]
+    if value == REDACTED:
+        return SUBSTITUTES.get(field.lower(), "replay")
+    return value
+
+
+def unredact_query(query):
+    # redact_query urlencode qiladi (<redacted> -> %3Credacted%3E) - matn replace emas
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return urlencode([(key, unredact(value, key)) for key, value in pairs])
+
+
+def build_request(record, token):
+    path = record["path"]
+    if record.get("query"):
+        path += "?" + unredact_query(record["query"])
+    headers = {}
+    if record.get("content_type"):
+        headers["content-type"] = record["content_type"]
+    if record.get("accept_encoding"):
+        headers["accept-encoding"] = record["accept_encoding"]
+    if record.get("auth"):
+        headers["authorization"] = f"Bearer {token}"
+    body = b""
+    if record.get("body") is not None:
+        body = json.dumps(unredact(record["body"])).encode()
+    return record["method"], path, headers, body
+
+
+async def replay(app, records, token, speed, concurrency):
+    results = []   # ("METHOD route", status, captured status, latency, lag)
+    semaphore = asyncio.Semaphore(concurrency)
+    first_ts = records[0]["ts"]
+
+    async def send_one(record, scheduled):
+        async with semaphore:
+            lag = max(0.0, time.perf_counter() - scheduled)
+            method, path, headers, body = build_request(record, token)
+            start = time.perf_counter()
+            status, _, _ = await asgi_request(app, method, path, headers, body)
+            results.append((route_key(record), status, record["status"], time.perf_counter() - start, lag))
+
+    tasks = []
+    start = time.perf_counter()
+    for record in records:
+        scheduled = start + ((record["ts"] - first_ts) / speed if speed else 0.0)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send_one(record, scheduled)))
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - start
+
+
+def report(records, results, elapsed):
+    captured = defaultdict(list)
+    for record in records:
+        captured[route_key(record)].append(record["latency_ms"] / 1000)
+
+    by_route = defaultdict(list)
+    for route, status, captured_status, latency, lag in results:
+        by_route[route].append((status, captured_status, latency))
+
+    routes = {}
+    for route, rows in sorted(by_route.items(), key=lambda item: -len(item[1])):
+        routes[route] = {
+            "requests": len(rows),
+            "errors": sum(1 for status, _, _ in rows if status >= 500),
+            "status_changed": sum(1 for status, before, _ in rows if status != before),
+            **percentiles([latency for _, _, latency in rows]),
+            "captured_p50": percentiles(captured[route])["p50"],
+        }
+    lags = [lag for *_, lag in results]
+    return {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "captured_span_s": round(records[-1]["ts"] - records[0]["ts"], 3),
+        "rps": round(len(results) / elapsed, 1) if elapsed else None,
+        "schedule_lag": percentiles(lags),
+        "routes": routes,
+    }
+
+
+def print_report(summary):
+    print(
+        f"{summary['requests']} requests in {summary['elapsed_s']}s "
+        f"(captured span {summary['captured_span_s']}s), {summary['rps']} req/s, "
+        f"schedule lag p95 {summary['schedule_lag']['p95']:.2f}ms"
+    )
+    print(
+        f"\n{'route':<42} {'n':>6} {'5xx':>5} {'Δstatus':>8} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'cap p50':>8}"
+    )
+    for route, row in summary["routes"].items():
+        print(
+            f"{route:<42} {row['requests']:>6} {row['errors']:>5} {row['status_changed']:>8} "
+            f"{row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} {row['captured_p50']:>8.2f}"
+        )
+
+
+async def main(args):
+    records = load_capture(args.files, args.limit)
+    if not records:
+        raise SystemExit("no captured requests")
+    try:
+        loadtest.seed()
+
+        import main as main_module
+
+        loadtest.disable_rate_limits(main_module)
+        async with main_module.lifespan(main_module.app):
+            token = await loadtest.login_token(main_module.app)
+            results, elapsed = await replay(
+                main_module.app, records, token, args.speed, args.concurrency,
+            )
+    finally:
+        loadtest.cleanup()
+
+    summary = report(records, results, elapsed)
+    summary["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": loadtest.git_commit(),
+        "python": platform.python_version(),
+        "files": [str(path) for path in args.files],
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+    }
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="+", type=Path, help="captured JSONL files")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="rate multiplier (2 = twice as fast, 0 = no delays)")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--limit", type=int, help="replay only the first N requests")
+    parser.add_argument("--output", help="write the report JSON here")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main(args))
+    print_report(summary)
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"\nReport written to {args.output}")
@@ -0,0 +1,70 @@
+"""
+Test setup: the real app on the service-free backends, like
+benchmarks/loadtest.py - a temporary SQLite file and CACHE_BACKEND=memory.
+
+Env is set before any app module is imported (settings read it once).
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# App modullari top-level import ishlatadi (core.*, services.*) - Docker dagi kabi
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+DB_DIR = tempfile.mkdtemp(prefix="tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["JOB_BACKEND"] = "memory"
+os.environ["WARMUP_ENABLED"] = "False"
+os.environ["LOOP_MONITOR_ENABLED"] = "False"
+os.environ["LOG_FILE_PATH"] = os.path.join(DB_DIR, "app.log")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient with the lifespan running (one event loop for the session)"""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+    shutil.rmtree(DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clean_state(client):
+    """Empty posts table and cache before every test"""
+    from sqlalchemy import delete
+
+    from core.database import SessionLocal
+    from core.redis_client import redis_client
+    from models.post import Post
+
+    with SessionLocal() as db:
+        db.execute(delete(Post))
+        db.commit()
+    redis_client.flushall()  # bytes client ham shu store
+
+
+@pytest.fixture
+def make_posts():
+    """make_posts(3, category="tech") -> list of post ids"""
+    from core.database import SessionLocal
+    from models.post import Post
+
+    def create(count, category=None):
+        with SessionLocal() as db:
+            posts = [Post(title=f"Post {i}", content="content", category=category) for i in range(count)]
+            db.add_all(posts)
+            db.commit()
+            return [post.id for post in posts]
+
+    return create
@@ -0,0 +1,82 @@
+"""
+SQL instrumentation (core.db_events) seen through a real route, and the lazy
+engines (core.database) that it is attached to.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prometheus_client import REGISTRY
+
+from core import database
+from core.config import settings
+from core.db_events import SLOW_QUERY_FORMAT
+
+
+@pytest.fixture
+def fresh_engines(client):
+    """Forget the engines, so the next session creates (and instruments) them again"""
+    saved = database._engine, database._async_engine
+    database._engine = database._async_engine = None
+    database.SessionLocal.configure(bind=None)
+    database.AsyncSessionLocal.configure(bind=None)
+    yield
+    if database._async_engine is not None:
+        client.portal.call(database._async_engine.dispose)
+    if database._engine is not None:
+        database._engine.dispose()
+    database._engine, database._async_engine = saved
+    database.SessionLocal.configure(bind=saved[0])
+    database.AsyncSessionLocal.configure(bind=saved[1])
+
+
+def _queries_observed(route: str) -> tuple:
+    labels = {"route": route}
+    count = REGISTRY.get_sample_value("db_queries_per_request_count", labels) or 0
+    total = REGISTRY.get_sample_value("db_queries_per_request_sum", labels) or 0
+    return count, total
+
+
+def test_route_records_query_count_and_slow_queries(client, fresh_engines, make_posts, monkeypatch, caplog):
+    # Threshold engine yaratilganda o'qiladi - 0 da har bir query "sekin"
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD_MS", 0)
+    make_posts(2)
+    before = _queries_observed("/api/v1/posts/")
+
+    with caplog.at_level(logging.WARNING, logger="core.db_events"):
+        response = client.get("/api/v1/posts/?skip=0&limit=10")
+
+    assert response.status_code == 200
+    count, total = _queries_observed("/api/v1/posts/")
+    assert count == before[0] + 1
+    assert total > before[1]
+
+    slow = [r for r in caplog.records if r.msg == SLOW_QUERY_FORMAT]
+    assert slow, "no SLOW QUERY record"
+    assert "SLOW QUERY" in slow[0].getMessage()
+    assert any(r.args[1] == "async" and "FROM posts" in r.args[3] for r in slow)
+
+
+def test_engine_created_once_under_concurrency(fresh_engines, monkeypatch):
+    threads = 8
+    create_engine = database.create_engine
+
+    def slow_create_engine(*args, **kwargs):
+        # Poyga oynasini kengaytirish: lock siz har thread o'z engine ini yaratardi
+        time.sleep(0.05)
+        return create_engine(*args, **kwargs)
+
+    monkeypatch.setattr(database, "create_engine", slow_create_engine)
+    barrier = threading.Barrier(threads)
+
+    def first_use(_):
+        barrier.wait()
+        return database.get_engine()
+
+    with ThreadPoolExecutor(threads) as pool:
+        engines = list(pool.map(first_use, range(threads)))
+
+    assert all(engine is engines[0] for engine in engines)
+    assert database.SessionLocal.kw["bind"] is engines[0]
@@ -0,0 +1,31 @@
+"""v2 feed cache keys: a category filter never shares the unfiltered feed's page"""
+from services import feed_cache
+
+
+def test_feed_keys_do_not_collide():
+    unfiltered = feed_cache.feed_key(None, None, 20)
+    assert feed_cache.feed_key("", None, 20) != unfiltered
+    assert feed_cache.feed_key("*", None, 20) != unfiltered
+    assert feed_cache.feed_key("a:b", None, 20) != feed_cache.feed_key("a", "b", 20)
+    assert feed_cache.pages_key("*") != feed_cache.pages_key(None)
+    assert feed_cache.pages_key("every") != feed_cache.ALL_PAGES_KEY
+
+
+def test_empty_category_is_rejected(client):
+    assert client.get("/api/v2/posts/?category=").status_code == 422
+
+
+def test_star_category_after_unfiltered_feed(client, make_posts):
+    make_posts(3, category="tech")
+
+    assert len(client.get("/api/v2/posts/").json()["data"]) == 3
+    # Avval cache dagi filtrsiz sahifa qaytardi - hamma postlar
+    assert client.get("/api/v2/posts/?category=*").json()["data"] == []
+
+
+def test_unfiltered_feed_after_star_category(client, make_posts):
+    make_posts(3, category="tech")
+
+    assert client.get("/api/v2/posts/?category=*").json()["data"] == []
+    # Avval bo'sh sahifa TTL davomida filtrsiz feed o'rnida turardi
+    assert len(client.get("/api/v2/posts/").json()["data"]) == 3
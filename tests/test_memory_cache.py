@@ -0,0 +1,24 @@
+"""CACHE_BACKEND=memory: one store behind both clients, one worker"""
+from core.config import settings
+from core.redis_client import redis_bytes_client, redis_client
+
+
+def test_clients_share_one_store():
+    redis_client.set("shared", "value")
+    redis_bytes_client.sadd("pages", "shared")
+
+    assert redis_bytes_client.get("shared") == b"value"
+    assert redis_client.smembers("pages") == {"shared"}
+    assert redis_bytes_client.delete("shared") == 1
+    assert redis_client.get("shared") is None
+
+
+def test_memory_backend_runs_one_worker(monkeypatch):
+    import serve
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "MAX_WORKERS", 8)
+    assert serve.worker_count() == 1
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    assert serve.worker_count() == 4
@@ -0,0 +1,52 @@
+"""PostInsertBatcher: a failing batch never leaves callers waiting"""
+import asyncio
+
+import pytest
+
+from schemas.post import PostCreate
+from services import post_batcher as batcher_module
+from services.post_batcher import PostInsertBatcher
+
+POST = PostCreate(title="Title", content="Content")
+
+
+def test_flusher_survives_unexpected_error(monkeypatch):
+    calls = []
+
+    async def write(self, batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        for _, future in batch:
+            future.set_result("created")
+
+    monkeypatch.setattr(PostInsertBatcher, "_write", write)
+
+    async def scenario():
+        batcher = PostInsertBatcher(max_size=10, window=0.001)
+        await batcher.start()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(batcher.submit(POST), timeout=1)
+        # Task tirik - keyingi insert navbat orqali yoziladi
+        assert await asyncio.wait_for(batcher.submit(POST), timeout=1) == "created"
+        await batcher.stop()
+
+    asyncio.run(scenario())
+    assert calls == [1, 1]
+
+
+def test_submit_writes_directly_when_flusher_is_gone(monkeypatch):
+    async def create_post(db, post):
+        return "direct"
+
+    monkeypatch.setattr(batcher_module.post_service, "create_post", create_post)
+
+    async def scenario():
+        batcher = PostInsertBatcher()
+        await batcher.start()
+        batcher._task.cancel()
+        await asyncio.sleep(0)
+        assert batcher._task.done()
+        return await asyncio.wait_for(batcher.submit(POST), timeout=1)
+
+    assert asyncio.run(scenario()) == "direct"
@@ -0,0 +1,26 @@
+"""v1 post list cache: the page is stored once and served from Redis after"""
+from core.redis_client import redis_bytes_client
+from services import post_cache
+
+
+def test_list_page_served_from_cache(client, make_posts):
+    make_posts(2)
+
+    first = client.get("/api/v1/posts/?skip=0&limit=10", headers={"Accept-Encoding": "identity"})
+    assert len(first.json()) == 2
+    assert redis_bytes_client.exists(post_cache.page_key(0, 10))
+
+    # Cache dan keyingi post ko'rinmaydi - sahifa DB ga bormadi
+    make_posts(1)
+    second = client.get("/api/v1/posts/?skip=0&limit=10", headers={"Accept-Encoding": "identity"})
+    assert second.content == first.content
+
+
+def test_compressed_variant_matches_identity(client, make_posts):
+    make_posts(40)  # COMPRESSION_MIN_SIZE dan katta sahifa
+
+    plain = client.get("/api/v1/posts/?skip=0&limit=50", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/posts/?skip=0&limit=50", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers.get("content-encoding") == "gzip"
+    # httpx gzip ni o'zi ochadi
+    assert compressed.json() == plain.json()